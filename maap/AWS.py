@@ -16,19 +16,19 @@ class AWS:
         earthdata_s3_credentials_endpoint,
         workspace_bucket_endpoint,
         api_header,
+        session=None,
     ):
-        self._api_header = api_header
+        # Every member API response is JSON; copied so the caller's headers are left untouched
+        self._api_header = dict(api_header, Accept="application/json")
         self._requester_pays_endpoint = requester_pays_endpoint
         self._earthdata_s3_credentials_endpoint = earthdata_s3_credentials_endpoint
         self._workspace_bucket_endpoint = workspace_bucket_endpoint
         self._s3_signed_url_endpoint = s3_signed_url_endpoint
+        self._session = session if session is not None else requests.Session()
         self._logger = logging.getLogger(__name__)
 
     def requester_pays_credentials(self, expiration=60 * 60 * 12):
-        headers = self._api_header
-        headers["Accept"] = "application/json"
-
-        response = requests.get(
+        response = self._session.get(
             url=self._requester_pays_endpoint + "?exp=" + str(expiration),
             headers=self._api_header,
         )
@@ -37,13 +37,11 @@ class AWS:
         return json.loads(response.text)
 
     def s3_signed_url(self, bucket, key, expiration=60 * 60 * 12):
-        headers = self._api_header
-        headers["Accept"] = "application/json"
         _url = self._s3_signed_url_endpoint.replace("{bucket}", bucket).replace(
             "{key}", key
         )
 
-        response = requests.get(
+        response = self._session.get(
             url=_url + "?exp=" + str(expiration), headers=self._api_header
         )
         response.raise_for_status()
@@ -51,14 +49,12 @@ class AWS:
         return json.loads(response.text)
 
     def earthdata_s3_credentials(self, endpoint_uri):
-        headers = self._api_header
-        headers["Accept"] = "application/json"
         _parsed_endpoint = urllib.parse.quote(urllib.parse.quote(endpoint_uri, safe=""))
         _url = self._earthdata_s3_credentials_endpoint.replace(
             "{endpoint_uri}", _parsed_endpoint
         )
 
-        response = requests.get(url=_url, headers=self._api_header)
+        response = self._session.get(url=_url, headers=self._api_header)
         response.raise_for_status()
 
         result = json.loads(response.text)
@@ -67,10 +63,7 @@ class AWS:
         return result
 
     def workspace_bucket_credentials(self):
-        headers = self._api_header
-        headers["Accept"] = "application/json"
-
-        response = requests.get(
+        response = self._session.get(
             url=self._workspace_bucket_endpoint,
             headers=self._api_header,
         )
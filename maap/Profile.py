@@ -7,22 +7,26 @@ class Profile:
     """
     Functions used for Member API interfacing
     """
-    def __init__(self, profile_endpoint, api_header):
-        self._api_header = api_header
+    def __init__(self, profile_endpoint, api_header, session=None):
+        # Account info is returned as JSON; the copy leaves the headers shared with other clients as they are
+        self._api_header = dict(api_header, Accept='application/json')
         self._profile_endpoint = profile_endpoint
+        self._session = session if session is not None else requests.Session()
         self._logger = logging.getLogger(__name__)
+        self._account_info = None
 
     def account_info(self):
-        headers = self._api_header
-        headers['Accept'] = 'application/json'
-
-        response = requests.get(
+        # The account behind this client's token does not change, so it is fetched once; failures are retried
+        if self._account_info is not None:
+            return self._account_info
+        response = self._session.get(
             url=self._profile_endpoint,
             headers=self._api_header
         )
 
         if response:
-            return json.loads(response.text)
+            self._account_info = json.loads(response.text)
+            return self._account_info
         else:
             return None
 
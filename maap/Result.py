@@ -13,12 +13,20 @@ if sys.version_info < (3, 0):
 else:
     from urllib.request import urlretrieve
 
+# Granules are often hundreds of MB, so they are streamed to disk in 1MB reads rather than shutil's 64KB default
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class Result(dict):
     """Class to structure the response XML from a CMR API request."""
 
-    _location = None
-    _fallback = None
+    # Searches can return thousands of results, so they carry no per-instance __dict__
+    __slots__ = ("_location", "_fallback", "_downloadname", "_cmrFileUrl", "_apiHeader", "_dps")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._location = None
+        self._fallback = None
 
     def getData(self, destpath=".", overwrite=False):
         """
@@ -90,6 +98,8 @@ class Result(dict):
 
             # Try with a federated token if unauthorized
             if r.status_code == 401:
+                # Only the status of the unauthorized response is used from here on, so its connection is released
+                r.close()
                 if self._dps.running_in_dps:
                     dps_token_response = requests.get(
                         url=self._dps.dps_token_endpoint,
@@ -126,11 +136,12 @@ class Result(dict):
                         stream=True,
                     )
 
-            r.raise_for_status()
-            r.raw.decode_content = True
+            with r:
+                r.raise_for_status()
+                r.raw.decode_content = True
 
-            with open(dest, "wb") as f:
-                shutil.copyfileobj(r.raw, f)
+                with open(dest, "wb") as f:
+                    shutil.copyfileobj(r.raw, f, _DOWNLOAD_CHUNK_SIZE)
 
         return dest
 
@@ -168,9 +179,10 @@ class Result(dict):
 
 
 class Collection(Result):
+    __slots__ = ()
+
     def __init__(self, metaResult, maap_host):
-        for k in metaResult:
-            self[k] = metaResult[k]
+        super().__init__(metaResult)
 
         self._location = "https://{}/search/concepts/{}.umm-json".format(
             maap_host, metaResult["concept-id"]
@@ -179,9 +191,12 @@ class Collection(Result):
 
 
 class Granule(Result):
+    __slots__ = ("_awsKey", "_awsSecret", "_relatedUrls", "_OPeNDAPUrl", "_BrowseUrl")
+
     def __init__(
         self, metaResult, awsAccessKey, awsAccessSecret, cmrFileUrl, apiHeader, dps
     ):
+        super().__init__(metaResult)
         self._awsKey = awsAccessKey
         self._awsSecret = awsAccessSecret
         self._cmrFileUrl = cmrFileUrl
@@ -189,20 +204,10 @@ class Granule(Result):
         self._dps = dps
 
         self._relatedUrls = None
-        self._location = None
         self._downloadname = None
         self._OPeNDAPUrl = None
         self._BrowseUrl = None
 
-        self._relatedUrls = None
-        self._location = None
-        self._downloadname = None
-        self._OPeNDAPUrl = None
-        self._BrowseUrl = None
-
-        for k in metaResult:
-            self[k] = metaResult[k]
-
         # TODO: make self._location an array and consolidate with _relatedUrls
         try:
             self._relatedUrls = self["Granule"]["OnlineAccessURLs"]["OnlineAccessURL"]
@@ -11,8 +11,9 @@ class Secrets:
     """
     Functions used for member secrets API interfacing
     """
-    def __init__(self, member_endpoint, api_header):
+    def __init__(self, member_endpoint, api_header, session=None):
         self._api_header = api_header
+        self._session = session if session is not None else requests.Session()
         self._members_endpoint = f"{member_endpoint}/{endpoints.MEMBERS_SECRETS}"
 
 
@@ -24,11 +25,11 @@ class Secrets:
             list: Returns a list of dicts containing secret names e.g. [{'secret_name': 'secret1'}, {'secret_name': 'secret2'}].
         """
         try:
-            response = requests.get(
+            response = self._session.get(
                 url = self._members_endpoint,
                 headers=self._api_header
             )
-            logger.debug(f"Response from get_secrets request: {response.text}")
+            logger.debug("Response from get_secrets request: %s", response.text)
             return json.loads(response.text)
         except Exception as e:
             raise(f"Error retrieving secrets: {e}")
@@ -51,7 +52,7 @@ class Secrets:
             raise ValueError("Secret name parameter cannot be None.")
 
         try:
-            response = requests.get(
+            response = self._session.get(
                 url = f"{self._members_endpoint}/{secret_name}",
                 headers=self._api_header
             )
@@ -61,7 +62,7 @@ class Secrets:
                 response = response.json()
                 return response["secret_value"]
 
-            logger.debug(f"Response from get_secret request: {response.text}")
+            logger.debug("Response from get_secret request: %s", response.text)
             return json.loads(response.text)
         except Exception as e:
             raise(f"Error retrieving secret: {e}")
@@ -85,13 +86,13 @@ class Secrets:
             raise ValueError("Failed to add secret. Secret name and secret value must not be 'None'.")
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 url = self._members_endpoint,
                 headers=self._api_header,
                 data=json.dumps({"secret_name": secret_name, "secret_value": secret_value})
             )
 
-            logger.debug(f"Response from add_secret: {response.text}")
+            logger.debug("Response from add_secret: %s", response.text)
             return json.loads(response.text)
         except Exception as e:
             raise(f"Error adding secret: {e}")
@@ -114,12 +115,12 @@ class Secrets:
             raise ValueError("Failed to delete secret. Please provide secret name.")
 
         try:
-            response = requests.delete(
+            response = self._session.delete(
                 url = f"{self._members_endpoint}/{secret_name}",
                 headers=self._api_header
             )
 
-            logger.debug(f"Response from delete_secret: {response.text}")
+            logger.debug("Response from delete_secret: %s", response.text)
             return json.loads(response.text)
         except Exception as e:
             raise(f"Error deleting secret: {e}")
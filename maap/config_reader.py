@@ -1,6 +1,8 @@
 import logging
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlparse, urljoin, urlunsplit, SplitResult
 from collections import namedtuple
 from functools import cache
@@ -70,10 +72,10 @@ def _get_client_config(maap_host):
 
 class MaapConfig:
     def __init__(self, maap_host):
-        self.__config = _get_client_config(maap_host)
+        self._config = _get_client_config(maap_host)
         self.maap_host = maap_host
-        self.maap_api_root = self.__config.get("service").get("maap_api_root")
-        self.maap_token = self.__config.get("service").get("maap_token")
+        self.maap_api_root = self._config.get("service").get("maap_api_root")
+        self.maap_token = self._config.get("service").get("maap_token")
         self.page_size = os.environ.get("MAAP_CMR_PAGE_SIZE", 20)
         self._PROXY_GRANTING_TICKET = os.environ.get("MAAP_PGT", '')
         self.content_type = os.environ.get("MAAP_CMR_CONTENT_TYPE", "application/echo10+xml")
@@ -81,6 +83,7 @@ class MaapConfig:
         self.algorithm_build = self._get_api_endpoint("algorithm_build")
         self.mas_algo = self._get_api_endpoint("mas_algo")
         self.dps_job = self._get_api_endpoint("dps_job")
+        self.dps_job_full = self._get_optional_api_endpoint("dps_job_full")
         self.member_dps_token = self._get_api_endpoint("member_dps_token")
         self.requester_pays = self._get_api_endpoint("requester_pays")
         self.edc_credentials = self._get_api_endpoint("edc_credentials")
@@ -88,20 +91,52 @@ class MaapConfig:
         self.s3_signed_url = self._get_api_endpoint("s3_signed_url")
         self.wmts = self._get_api_endpoint("wmts")
         self.member = self._get_api_endpoint("member")
-        self.tiler_endpoint = self.__config.get("service").get("tiler_endpoint")
+        self.tiler_endpoint = self._config.get("service").get("tiler_endpoint")
         self.aws_access_key = os.environ.get("MAAP_AWS_ACCESS_KEY_ID")
         self.aws_access_secret = os.environ.get("MAAP_AWS_SECRET_ACCESS_KEY")
         self.s3_user_upload_bucket = os.environ.get("MAAP_S3_USER_UPLOAD_BUCKET")
         self.s3_user_upload_dir = os.environ.get("MAAP_S3_USER_UPLOAD_DIR")
         self.search_granule_url = self._get_api_endpoint("search_granule_url")
         self.search_collection_url = self._get_api_endpoint("search_collection_url")
-        self.indexed_attributes = self.__config.get("search").get("indexed_attributes")
+        self.indexed_attributes = self._config.get("search").get("indexed_attributes")
         self.mapbox_token = os.environ.get("MAAP_MAPBOX_ACCESS_TOKEN", '')
+        self._session = None
+
+    @property
+    def session(self):
+        """
+        HTTP session shared by the clients built from this config, so repeated calls to the MAAP API
+        reuse pooled TCP+TLS connections instead of opening a new one per request
+        """
+        if self._session is None:
+            self._session = requests.Session()
+            # Error statuses are retried only for idempotent methods, so a job submission is never sent twice
+            retries = Retry(total=5, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                            respect_retry_after_header=True, raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+            # Plain http is mounted too, for local and test deployments of the MAAP API
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        return self._session
+
+    def close(self):
+        """
+        Close the pooled connections of the shared HTTP session. The session stays usable and opens new connections
+        if it is needed again, so clients holding it keep sharing it.
+        """
+        if self._session is not None:
+            self._session.close()
 
     def _get_api_endpoint(self, config_key):
         # Remove any prefix "/" for urljoin
-        endpoint = str(self.__config.get("maap_endpoint").get(config_key)).strip("/")
+        endpoint = str(self._config.get("maap_endpoint").get(config_key)).strip("/")
         return urljoin(self.maap_api_root, endpoint)
 
+    def _get_optional_api_endpoint(self, config_key):
+        # Endpoints that not every MAAP API deployment provides resolve to None instead of "None"
+        if not self._config.get("maap_endpoint").get(config_key):
+            return None
+        return self._get_api_endpoint(config_key)
+
     def get(self, profile, key):
-        return self.__config.get(profile, key)
+        return self._config.get(profile, key)
@@ -1,11 +1,22 @@
 import datetime
 import requests
-import xml.etree.ElementTree as ET
 import logging
-import json
+import re
 from os.path import exists
+from xml.sax.saxutils import escape
 
 import importlib_resources as resources
+from maap.utils.xml_utils import fromstring
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Request templates are read once at import rather than on every submit_job call
+_EXECUTE_XML = resources.files("maap.dps").joinpath("execute.xml").read_text()
+_EXECUTE_INPUTS_XML = resources.files("maap.dps").joinpath("execute_inputs.xml").read_text()
+# The input template split around its {name} and {value} placeholders, so each input is a plain concatenation
+_INPUT_PREFIX, _INPUT_MIDDLE, _INPUT_SUFFIX = re.split(r'\{name\}|\{value\}', _EXECUTE_INPUTS_XML)
 
 
 class DpsHelper:
@@ -15,15 +26,21 @@ class DpsHelper:
     """
     Functions used for DPS API interfacing
     """
-    def __init__(self, api_header, dps_token_endpoint):
+    __slots__ = ('_api_header', '_logger', '_session', 'dps_token_endpoint', 'running_in_dps', 'dps_machine_token',
+                 'job_id')
+
+    def __init__(self, api_header, dps_token_endpoint, session=None):
         self._api_header = api_header
+        self._session = session if session is not None else requests.Session()
         self._logger = logging.getLogger(__name__)
         self.dps_token_endpoint = dps_token_endpoint
         self.running_in_dps = self._running_in_dps_mode()
 
         if self.running_in_dps:
             self.dps_machine_token = self._file_contents(self.DPS_INTERNAL_FILE_DPS_TOKEN)
-            job_data = json.loads(self._file_contents(self.DPS_INTERNAL_FILE_JOB))
+            # The job payload can be large; it is parsed straight from the file's bytes
+            with open(self.DPS_INTERNAL_FILE_JOB, 'rb') as file:
+                job_data = json_loads(file.read())
             self.job_id = job_data['job_info']['job_payload']['payload_task_id']
 
     def _skit(self, lines, kwargs):
@@ -35,9 +52,6 @@ class DpsHelper:
         return res
 
     def submit_job(self, request_url, **kwargs):
-        xml_file = resources.files("maap.dps").joinpath("execute.xml")
-        input_xml = resources.files("maap.dps").joinpath("execute_inputs.xml")
-
         # ==================================
         # Part 1: Parse Required Arguments
         # ==================================
@@ -61,14 +75,7 @@ class DpsHelper:
             except:
                 inputs[f] = ''
 
-        logging.debug('fields are')
-        logging.debug(fields)
-
-        logging.debug('params are')
-        logging.debug(params)
-
-        logging.debug('inputs are')
-        logging.debug(inputs)
+        logging.debug('fields are %s\nparams are %s\ninputs are %s', fields, params, inputs)
 
         params['timestamp'] = str(datetime.datetime.today())
         if 'username' in params.keys() and inputs['username'] == '':
@@ -78,42 +85,35 @@ class DpsHelper:
         # Part 2: Build & Send Request
         # ==================================
         req_xml = ''
-        ins_xml = ''
-
-        other = ''
-        ins_xml = input_xml.read_text()
 
         # -------------------------------
         # Insert XML for algorithm inputs
         # -------------------------------
-        for key in input_names:
-            other += ins_xml.format(name=key, value=input_names[key])
-            other += '\n'
+        # Names go into an id="..." attribute and values into a CDATA section; escape what would end either early
+        other = ''.join(
+            _INPUT_PREFIX + escape(key, {'"': '&quot;'}) + _INPUT_MIDDLE
+            + str(value).replace(']]>', ']]]]><![CDATA[>') + _INPUT_SUFFIX + '\n'
+            for key, value in input_names.items()
+        )
 
         # print(other)
         params['other_inputs'] = other
 
-        req_xml = xml_file.read_text().format(**params)
-
-        # log request body
-        logging.debug('request is')
-        logging.debug(req_xml)
+        req_xml = _EXECUTE_XML.format(**params)
 
-        # log request headers
-        logging.debug('headers:')
-        logging.debug(self._api_header)
+        logging.debug('request is\n%s\nheaders: %s', req_xml, self._api_header)
 
         # -------------------------------
         # Send Request
         # -------------------------------
         try:
-            r = requests.post(
+            r = self._session.post(
                 url=request_url,
-                data=req_xml,
+                # Sent as UTF-8 bytes; a str body would be encoded as latin-1 by http.client
+                data=req_xml.encode('utf-8'),
                 headers=self._api_header
             )
-            logging.debug('status code {}'.format(r.status_code))
-            logging.debug('response text\n{}'.format(r.text))
+            logging.debug('status code %s\nresponse text\n%s', r.status_code, r.text)
 
             # ==================================
             # Part 3: Check & Parse Response
@@ -122,7 +122,7 @@ class DpsHelper:
             if r.status_code == 200:
                 try:
                     # parse out JobID from response
-                    rt = ET.fromstring(r.text)
+                    rt = fromstring(r.content)
 
                     # if bad request, show provided parameters
                     if 'Exception' in r.text:
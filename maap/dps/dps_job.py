@@ -1,23 +1,108 @@
 import json
 import logging
 import os
-import xml.etree.ElementTree as ET
-import backoff
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from typing import List, Optional, Union
 from urllib.parse import urljoin
+from xml.sax.saxutils import unescape
 from maap.utils import endpoints
 from maap.config_reader import MaapConfig
 from maap.utils import requests_utils
+from maap.utils.xml_utils import fromstring, iterparse
+try:
+    import orjson
 
-logger = logging.getLogger(__name__)
-BACKOFF_CONF = {}
-
-
-def _backoff_get_max_time(self):
-    return self.__backoff_maxtime
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
 
-
-def _backoff_get_max_value(self):
-    return self.__max_value
+logger = logging.getLogger(__name__)
+_WPS_NS = '{http://www.opengis.net/wps/2.0}'
+_TAG_JOB_ID = _WPS_NS + 'JobID'
+_TAG_STATUS = _WPS_NS + 'Status'
+_TAG_OUTPUT = _WPS_NS + 'Output'
+_TAG_DATA = _WPS_NS + 'Data'
+_TAG_ERROR = _WPS_NS + 'Error'
+# ElementPath queries for an already parsed result; lxml and the stdlib both cache their compiled form
+_PATH_OUTPUT_DATA = _TAG_OUTPUT + '/' + _TAG_DATA
+_PATH_ERROR_LINES = _TAG_ERROR + '/*'
+# Status documents carry only a JobID and a Status, so they are read with a regex instead of a full XML parse
+_STATUS_RE = re.compile(rb'<(?:\w+:)?(JobID|Status)\b[^>]*(?<!/)>\s*([^<&]*?)\s*</')
+# Result documents are a flat list of Data values, which are likewise read with a regex when that is exact
+_OUTPUT_RE = re.compile(rb'<(?:\w+:)?Output\b[^>]*(?<!/)>(.*?)</(?:\w+:)?Output>', re.DOTALL)
+_DATA_RE = re.compile(rb'<(?:\w+:)?Data\b[^>]*(?<!/)>([^<]*)</')
+_DATA_TAG_RE = re.compile(rb'<(?:\w+:)?Data\b')
+# Metrics DPS reports for a job, in display order
+_METRIC_NAMES = (
+    'machine_type', 'architecture', 'machine_memory_size', 'directory_size', 'operating_system',
+    'job_start_time', 'job_end_time', 'job_duration_seconds', 'cpu_usage', 'cache_usage', 'mem_usage',
+    'max_mem_usage', 'swap_usage', 'read_io_stats', 'write_io_stats', 'sync_io_stats', 'async_io_stats',
+    'total_io_stats',
+)
+_METRIC_FIELDS = frozenset(_METRIC_NAMES)
+# Numeric metrics are converted once when parsed rather than left as raw XML text
+_METRIC_TYPES = {
+    'directory_size': int, 'job_duration_seconds': float, 'cpu_usage': int, 'cache_usage': int, 'mem_usage': int,
+    'max_mem_usage': int, 'swap_usage': int, 'read_io_stats': int, 'write_io_stats': int, 'sync_io_stats': int,
+    'async_io_stats': int, 'total_io_stats': int,
+}
+# Once a job reaches one of these states its status, result and metrics no longer change
+_FINAL_STATUSES = frozenset({'succeeded', 'failed', 'dismissed'})
+# DPS reports a missing measurement as an empty tag or the text 'None'
+_NULLISH = frozenset({None, '', 'None'})
+# Attributes reported by DPSJob.__str__ between the job id and the outputs, in display order
+_PUBLIC_SLOTS = ('status',) + _METRIC_NAMES + ('error_details', 'response_code')
+
+
+def _as_bytes(input_xml_str):
+    # The regex fast paths read bytes
+    if isinstance(input_xml_str, str):
+        return input_xml_str.encode()
+    return input_xml_str
+
+
+def _parse_xml(input_xml_str):
+    return fromstring(input_xml_str)
+
+
+def _xml_text(value):
+    # Text of a leaf element read by regex, decoded the way the XML parser would
+    text = value.decode()
+    if not text:
+        return None
+    if '&' in text:
+        return unescape(text, {'&quot;': '"', '&apos;': "'"})
+    return text
+
+
+@lru_cache(maxsize=128)
+def _local(tag):
+    # '{namespace}name' -> 'name'; lxml gives comments and processing instructions a non-str tag, which map to None
+    if not isinstance(tag, str):
+        return None
+    # Metrics tags carry no namespace and are returned as-is
+    if not tag.startswith('{'):
+        return tag
+    return tag[tag.index('}') + 1:]
+
+
+def _typed_metric(name, value):
+    if value in _NULLISH:
+        return None
+    convert = _METRIC_TYPES.get(name)
+    if convert is None:
+        return value
+    try:
+        return convert(value)
+    except ValueError:
+        logger.debug('Unable to convert metric %s value %r to %s', name, value, convert.__name__)
+        return value
 
 
 class DPSJob:
@@ -33,81 +118,193 @@ class DPSJob:
     job.dismiss_job()
     job.delete_job()
     """
-    def __init__(self, config: MaapConfig, not_self_signed=True):
+    __slots__ = (
+        'config', '_not_self_signed', 'poll_base', 'poll_initial', 'response_code', 'error_details', '_id',
+        'status', 'outputs', 'traceback', 'metrics', '_session', 'status_ttl', '_status_checked_at', '_final_urls',
+        '_status_etag', '_status_url', '_result_url', '_metrics_url', '_cancel_url', '_full_url',
+    ) + _METRIC_NAMES
+
+    def __init__(self, config: MaapConfig, not_self_signed=True, poll_base=1.3, poll_initial=0.05, status_ttl=0):
         self.config = config
-        self.__not_self_signed = not_self_signed
-        self.__response_code = None
-        self.__error_details = None
-        self.__id = None
-        self.__status = None
-        self.__machine_type = None
-        self.__architecture = None
-        self.__machine_memory_size = None
-        self.__directory_size = None
-        self.__operating_system = None
-        self.__job_start_time = None
-        self.__job_end_time = None
-        self.__job_duration_seconds = None
-        self.__cpu_usage = None
-        self.__cache_usage = None
-        self.__mem_usage = None
-        self.__max_mem_usage = None
-        self.__swap_usage = None
-        self.__read_io_stats = None
-        self.__write_io_stats = None
-        self.__sync_io_stats = None
-        self.__async_io_stats = None
-        self.__total_io_stats = None
-        self.__outputs = []
-        self.__traceback = None
-        self.__metrics = dict()
-        
-    def retrieve_status(self):
+        self._not_self_signed = not_self_signed
+        # Status polling schedule used by wait_for_completion: poll_initial * poll_base ** n seconds
+        self.poll_base = poll_base
+        self.poll_initial = poll_initial
+        self.response_code = None
+        self.error_details = None
+        self.id = None
+        self.status = None
+        self.machine_type = None
+        self.architecture = None
+        self.machine_memory_size = None
+        self.directory_size = None
+        self.operating_system = None
+        self.job_start_time = None
+        self.job_end_time = None
+        self.job_duration_seconds = None
+        self.cpu_usage = None
+        self.cache_usage = None
+        self.mem_usage = None
+        self.max_mem_usage = None
+        self.swap_usage = None
+        self.read_io_stats = None
+        self.write_io_stats = None
+        self.sync_io_stats = None
+        self.async_io_stats = None
+        self.total_io_stats = None
+        # Allocated when a result document is parsed; most jobs built for status checks never get one
+        self.outputs: Optional[List[str]] = None
+        self.traceback = []
+        self.metrics = {}
+        # Keep the connection to DPS alive across status polls instead of a new TCP+TLS handshake per request
+        self._session = config.session
+        # retrieve_status answers from the last poll if it is younger than status_ttl seconds; 0 always asks DPS
+        self.status_ttl = status_ttl
+
+    @property
+    def id(self):
+        return self._id
+
+    @id.setter
+    def id(self, val):
+        """
+        Set the job id and build the job's DPS URLs once, so polling does not rebuild them per request
+        :param val: job id
+        :return: None
+        """
+        if val is not None and val == getattr(self, '_id', None):
+            # Re-setting the same id, e.g. from the JobID of a status response, keeps the polling state
+            return
+        self._id = val
+        # A job object reused for another job must not answer from the previous job's status, ETag or documents
+        self._status_etag = None
+        self._status_checked_at = None
+        # Result/metrics URLs already fetched after the job finished; those documents are not requested again
+        self._final_urls = set()
         # Not using os.path.join just to be safe as this can break if ever run on windows
         # not using urljoin as that requires more preprocessing to avoid dropping api root while joining
         # eg. urljoing("https://api.maap-project.org/api/dps", "id/status") will drop "api/dps" from the output
-        url = f"{self.config.dps_job}/{self.id}/{endpoints.DPS_JOB_STATUS}"
-        response = requests_utils.make_dps_request(url, self.config)
-        self.set_job_status_result(response)
+        self._status_url = f"{self.config.dps_job}/{val}/{endpoints.DPS_JOB_STATUS}"
+        self._result_url = f"{self.config.dps_job}/{val}"
+        self._metrics_url = f"{self.config.dps_job}/{val}/{endpoints.DPS_JOB_METRICS}"
+        self._cancel_url = f"{self.config.dps_job}/{endpoints.DPS_JOB_DISMISS}/{val}"
+        # Only set when the MAAP API advertises an endpoint returning status, result and metrics in one document
+        self._full_url = f"{self.config.dps_job_full}/{val}" if self.config.dps_job_full else None
+
+    def retrieve_status(self):
+        if self._status_checked_at is not None and time.monotonic() - self._status_checked_at < self.status_ttl:
+            return self.status
+        return self._retrieve_status()
+
+    def _retrieve_status(self):
+        # Ask DPS to answer 304 Not Modified when the status has not changed since the previous poll
+        extra_headers = {'If-None-Match': self._status_etag} if self._status_etag else None
+        response = requests_utils.make_request(self._status_url, self.config, session=self._session,
+                                               extra_headers=extra_headers)
+        self._status_checked_at = time.monotonic()
+        if response.status_code == 304:
+            return self.status
+        self._status_etag = response.headers.get('ETag')
+        self.set_job_status_result(response.content)
         return self.status
 
-    @backoff.on_exception(backoff.expo, Exception, max_value=64, max_time=172800)
-    def wait_for_completion(self):
-        self.retrieve_status()
-        if self.status.lower() in ["accepted", "running"]:
-            logger.debug('Current Status is {}. Backing off.'.format(self.status))
-            raise RuntimeError
-        return self
+    @classmethod
+    def bulk_retrieve_status(cls, jobs, max_workers=16):
+        """
+        Retrieve the status of many jobs concurrently over the jobs' shared connection pool.
+        DPS has no batched status endpoint, so the per-job requests are fanned out on a thread pool.
+        :param jobs: list of DPSJob
+        :param max_workers: maximum number of concurrent status requests
+        :return: list of statuses in the same order as jobs
+        """
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            return list(executor.map(cls._retrieve_status, jobs))
+
+    def wait_for_completion(self, max_tries=None, max_time=172800):
+        """
+        Poll the job status until the job leaves the accepted/running states.
+
+        The wait between polls starts at poll_initial seconds and grows by a factor of poll_base,
+        capped at 64 seconds, so short jobs return quickly while long jobs are not polled aggressively.
+        Failed status requests are retried on the same schedule.
+        :param max_tries: optional upper bound on the number of status polls
+        :param max_time: seconds after which to stop polling
+        :return: self
+        """
+        deadline = time.monotonic() + max_time
+        delay = self.poll_initial
+        tries = 0
+        while True:
+            tries += 1
+            exhausted = (max_tries is not None and tries >= max_tries) or time.monotonic() >= deadline
+            try:
+                status = self._retrieve_status()
+            except Exception:
+                if exhausted:
+                    raise
+                logger.debug('Status request failed. Backing off.', exc_info=True)
+            else:
+                if status.lower() not in ("accepted", "running"):
+                    return self
+                if exhausted:
+                    raise RuntimeError('Job {} is still {} after {} status polls'.format(self.id, status, tries))
+                logger.debug('Current Status is %s. Backing off.', status)
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * self.poll_base, 64)
+
+    def _fetch_final(self, url, parse):
+        """
+        Fetch and parse a result or metrics document, unless it was already parsed after the job finished
+        :param url: result or metrics URL of this job
+        :param parse: method parsing the response body
+        :raises requests.HTTPError: if DPS answers with an error
+        """
+        if url in self._final_urls:
+            return
+        response = requests_utils.make_request(url, self.config, session=self._session)
+        response.raise_for_status()
+        parse(response.content)
+        if self.status is not None and self.status.lower() in _FINAL_STATUSES:
+            self._final_urls.add(url)
 
     def retrieve_result(self):
-        url = f"{self.config.dps_job}/{self.id}"
-        response = requests_utils.make_dps_request(url, self.config)
-        self.set_job_results_result(response)
+        self._fetch_final(self._result_url, self.set_job_results_result)
         return self.outputs
 
     def retrieve_metrics(self):
-        url = f"{self.config.dps_job}/{self.id}/{endpoints.DPS_JOB_METRICS}"
-        response = requests_utils.make_dps_request(url, self.config)
-        self.set_job_metrics_result(response)
+        self._fetch_final(self._metrics_url, self.set_job_metrics_result)
         return self.metrics
 
     def retrieve_attributes(self):
+        if self._full_url is not None:
+            response = requests_utils.make_request(self._full_url, self.config, session=self._session)
+            # Without a snapshot (e.g. older API deployments) the job is read through the individual requests
+            if response.ok:
+                return self.set_job_full_result(response.content)
         self.retrieve_status()
-        if self.status.lower() in ["succeeded", "failed"]:
-            try:
-                self.retrieve_result()
-            except:
-                pass
-            try:
-                # In case job is failed, metrics will throw an error
-                self.retrieve_metrics()
-            except:
-                pass
+        status = self.status.lower()
+        # A failed job reports its traceback through the result document, but only successful jobs have metrics
+        if status == "succeeded":
+            retrievals = (self.retrieve_result, self.retrieve_metrics)
+        elif status == "failed":
+            retrievals = (self.retrieve_result,)
+        else:
+            return self
+        # The result and metrics documents are independent, so both requests are in flight at once
+        with ThreadPoolExecutor(max_workers=len(retrievals)) as executor:
+            futures = [executor.submit(retrieve) for retrieve in retrievals]
+        for retrieve, future in zip(retrievals, futures):
+            # As before, a document DPS cannot serve leaves its attributes empty rather than failing the whole job
+            error = future.exception()
+            if error is not None:
+                logger.warning('%s failed for job %s: %s', retrieve.__name__, self.id, error)
         return self
 
     def cancel_job(self):
-        url = f"{self.config.dps_job}/{endpoints.DPS_JOB_DISMISS}/{self.id}"
-        response = requests_utils.make_dps_request(url, self.config, request_type=requests_utils.POST)
+        response = requests_utils.make_dps_request(self._cancel_url, self.config, request_type=requests_utils.POST,
+                                                   session=self._session)
         return response
 
     def set_submitted_job_result(self, input_json: dict):
@@ -122,24 +319,33 @@ class DPSJob:
             self.error_details = input_json['details']
         return self
 
-    def set_job_status_result(self, input_xml_str: str):
+    def set_job_status_result(self, input_xml_str: Union[str, bytes]):
         """
         Sample:
         <?xml version="1.0" ?>
         <wps:StatusInfo xmlns:ows="http://www.opengis.net/ows/2.0" xmlns:schemaLocation="http://schemas.opengis.net/wps/2.0/wps.xsd" xmlns:wps="http://www.opengis.net/wps/2.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
-            <wps:self.id>50314f32-6099-47fa-8270-c378ac5ff83b</wps:self.id>
+            <wps:JobID>50314f32-6099-47fa-8270-c378ac5ff83b</wps:JobID>
             <wps:Status>Succeeded</wps:Status>
         </wps:StatusInfo>
         """
-        input_xml = ET.ElementTree(ET.fromstring(input_xml_str))
-        for each in input_xml.getroot():
-            if each.tag.endswith('self.id'):
+        input_xml_str = _as_bytes(input_xml_str)
+        fields = dict(_STATUS_RE.findall(input_xml_str))
+        if b'JobID' not in fields or b'Status' not in fields:
+            # Anything the regex cannot read (entities, CDATA, unexpected layout) goes through the XML parser
+            return self._set_status_fields(_parse_xml(input_xml_str))
+        self.id = fields[b'JobID'].decode()
+        self.status = fields[b'Status'].decode()
+        return self
+
+    def _set_status_fields(self, root):
+        for each in root:
+            if each.tag == _TAG_JOB_ID:
                 self.id = each.text.strip()
-            elif each.tag.endswith('Status'):
+            elif each.tag == _TAG_STATUS:
                 self.status = each.text.strip()
         return self
 
-    def set_job_metrics_result(self, input_xml_str: str):
+    def set_job_metrics_result(self, input_xml_str: Union[str, bytes]):
         """
         Sample:
         <?xml version="1.0" ?>
@@ -164,393 +370,83 @@ class DPSJob:
             <total_io_stats>0</total_io_stats>
         </metrics>
         """
-        input_xml = ET.ElementTree(ET.fromstring(input_xml_str))
-        for each in input_xml.getroot():
-            name, value = each.tag.strip(), each.text
-            self.__metrics.update({name: value})
-            if name == 'machine_type':
-                self.machine_type = value
-            elif name == 'architecture':
-                self.architecture = value
-            elif name == 'machine_memory_size':
-                self.machine_memory_size = value
-            elif name == 'directory_size':
-                self.directory_size = value
-            elif name == 'operating_system':
-                self.operating_system = value
-            elif name == 'job_start_time':
-                self.job_start_time = value
-            elif name == 'job_end_time':
-                self.job_end_time = value
-            elif name == 'job_duration_seconds':
-                self.job_duration_seconds = value
-            elif name == 'cpu_usage':
-                self.cpu_usage = value
-            elif name == 'cache_usage':
-                self.cache_usage = value
-            elif name == 'mem_usage':
-                self.mem_usage = value
-            elif name == 'max_mem_usage':
-                self.max_mem_usage = value
-            elif name == 'swap_usage':
-                self.swap_usage = value
-            elif name == 'read_io_stats':
-                self.read_io_stats = value
-            elif name == 'write_io_stats':
-                self.write_io_stats = value
-            elif name == 'sync_io_stats':
-                self.sync_io_stats = value
-            elif name == 'async_io_stats':
-                self.async_io_stats = value
-            elif name == 'total_io_stats':
-                self.total_io_stats = value
+        return self._set_metric_fields(_parse_xml(input_xml_str))
+
+    def _set_metric_fields(self, root):
+        for each in root:
+            name = _local(each.tag)
+            if name in _METRIC_FIELDS:
+                value = _typed_metric(name, each.text)
+                setattr(self, name, value)
+                self.metrics[name] = value
         return self
 
-    def set_job_results_result(self, input_xml_str: str):
+    def set_job_results_result(self, input_xml_str: Union[str, bytes]):
         """
         Sample:
-        <wps:Result xmlns:ows="http://www.opengis.net/ows/2.0" xmlns:schemaLocation="http://schemas.opengis.net/wps/2.0/wps.xsd" xmlns:wps="http://www.opengis.net/wps/2.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"><wps:self.id>f3780917-92c0-4440-8a84-9b28c2e64fa8</wps:self.id><wps:Output id="output-2021-05-26T18:39:14.381083"><wps:Data>http://geospec-dataset-bucket-dev.s3-website.amazonaws.com/malarout/dps_output/hytools_ubuntu/v-system-test-5/2021/05/26/18/39/14/381083</wps:Data><wps:Data>s3://s3.amazonaws.com:80/geospec-dataset-bucket-dev/malarout/dps_output/hytools_ubuntu/v-system-test-5/2021/05/26/18/39/14/381083</wps:Data><wps:Data>https://s3.console.aws.amazon.com/s3/buckets/geospec-dataset-bucket-dev/malarout/dps_output/hytools_ubuntu/v-system-test-5/2021/05/26/18/39/14/381083/?region=us-east-1&amp;tab=overview</wps:Data></wps:Output></wps:Result>
-        """
-        input_xml = ET.ElementTree(ET.fromstring(input_xml_str))
-        for each in input_xml.getroot():
-            if each.tag.endswith('Output'):
-                for eachOutput in each:
-                    if eachOutput.tag.endswith('Data'):
-                        self.outputs.append(eachOutput.text)
-            elif each.tag.endswith('Error'):
-                for eachOutput in each:
-                    self.traceback.append(eachOutput.text)
+        <wps:Result xmlns:ows="http://www.opengis.net/ows/2.0" xmlns:schemaLocation="http://schemas.opengis.net/wps/2.0/wps.xsd" xmlns:wps="http://www.opengis.net/wps/2.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"><wps:JobID>f3780917-92c0-4440-8a84-9b28c2e64fa8</wps:JobID><wps:Output id="output-2021-05-26T18:39:14.381083"><wps:Data>http://geospec-dataset-bucket-dev.s3-website.amazonaws.com/malarout/dps_output/hytools_ubuntu/v-system-test-5/2021/05/26/18/39/14/381083</wps:Data><wps:Data>s3://s3.amazonaws.com:80/geospec-dataset-bucket-dev/malarout/dps_output/hytools_ubuntu/v-system-test-5/2021/05/26/18/39/14/381083</wps:Data><wps:Data>https://s3.console.aws.amazon.com/s3/buckets/geospec-dataset-bucket-dev/malarout/dps_output/hytools_ubuntu/v-system-test-5/2021/05/26/18/39/14/381083/?region=us-east-1&amp;tab=overview</wps:Data></wps:Output></wps:Result>
+        """
+        payload = _as_bytes(input_xml_str)
+        # Errors, comments, CDATA, character references or a Data tag the regex did not capture need the parser
+        if b'Error' not in payload and b'<!' not in payload and b'&#' not in payload:
+            # Like the parser, only Data inside an Output counts; any other Data sends the document to the parser
+            values = [value for output in _OUTPUT_RE.findall(payload) for value in _DATA_RE.findall(output)]
+            if len(values) == len(_DATA_TAG_RE.findall(payload)):
+                self.outputs = [_xml_text(value) for value in values]
+                self.traceback = []
+                return self
+        # Each result document replaces the previous one, so repeated retrievals do not accumulate outputs
+        self.outputs = []
+        self.traceback = []
+        # Streamed so that only the current Output is held in memory, however many outputs the job produced
+        depth = 0
+        for event, elem in iterparse(BytesIO(payload), events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                continue
+            depth -= 1
+            # Only children of the root, as read by _set_result_fields
+            if depth == 1 and elem.tag == _TAG_OUTPUT:
+                self.outputs.extend(data.text for data in elem.iterfind(_TAG_DATA))
+                elem.clear()
+            elif depth == 1 and elem.tag == _TAG_ERROR:
+                self.traceback.extend(line.text for line in elem.iterfind('*'))
+                elem.clear()
         return self
 
-    def __str__(self):
-        return str({
-            'job_id': self.id,
-            'status': self.status,
-            'machine_type': self.machine_type,
-            'architecture': self.architecture,
-            'machine_memory_size': self.machine_memory_size,
-            'directory_size': self.directory_size,
-            'operating_system': self.operating_system,
-            'job_start_time': self.job_start_time,
-            'job_end_time': self.job_end_time,
-            'job_duration_seconds': self.job_duration_seconds,
-            'cpu_usage': self.cpu_usage,
-            'cache_usage': self.cache_usage,
-            'mem_usage': self.mem_usage,
-            'max_mem_usage': self.max_mem_usage,
-            'swap_usage': self.swap_usage,
-            'read_io_stats': self.read_io_stats,
-            'write_io_stats': self.write_io_stats,
-            'sync_io_stats': self.sync_io_stats,
-            'async_io_stats': self.async_io_stats,
-            'total_io_stats': self.total_io_stats,
-            'error_details': self.error_details,
-            'response_code': self.response_code,
-            'outputs': self.outputs
-        })
-
-    def __repr__(self):
-        return self.__str__()
-
-    @property
-    def id(self):
-        return self.__id
-
-    @id.setter
-    def id(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__id = val
-        return
-
-    @property
-    def status(self):
-        return self.__status
-
-    @status.setter
-    def status(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__status = val
-        return
-
-    @property
-    def machine_type(self):
-        return self.__machine_type
-
-    @machine_type.setter
-    def machine_type(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__machine_type = val
-        return
-
-    @property
-    def architecture(self):
-        return self.__architecture
-
-    @architecture.setter
-    def architecture(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__architecture = val
-        return
-
-    @property
-    def machine_memory_size(self):
-        return self.__machine_memory_size
-
-    @machine_memory_size.setter
-    def machine_memory_size(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__machine_memory_size = val
-        return
-
-    @property
-    def directory_size(self):
-        return self.__directory_size
-
-    @directory_size.setter
-    def directory_size(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__directory_size = val
-        return
-
-    @property
-    def operating_system(self):
-        return self.__operating_system
-
-    @operating_system.setter
-    def operating_system(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__operating_system = val
-        return
-
-    @property
-    def job_start_time(self):
-        return self.__job_start_time
-
-    @job_start_time.setter
-    def job_start_time(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__job_start_time = val
-        return
-
-    @property
-    def job_end_time(self):
-        return self.__job_end_time
-
-    @job_end_time.setter
-    def job_end_time(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__job_end_time = val
-        return
-
-    @property
-    def job_duration_seconds(self):
-        return self.__job_duration_seconds
-
-    @job_duration_seconds.setter
-    def job_duration_seconds(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__job_duration_seconds = val
-        return
-
-    @property
-    def cpu_usage(self):
-        return self.__cpu_usage
-
-    @cpu_usage.setter
-    def cpu_usage(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__cpu_usage = val
-        return
-
-    @property
-    def cache_usage(self):
-        return self.__cache_usage
-
-    @cache_usage.setter
-    def cache_usage(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__cache_usage = val
-        return
-
-    @property
-    def mem_usage(self):
-        return self.__mem_usage
-
-    @mem_usage.setter
-    def mem_usage(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__mem_usage = val
-        return
-
-    @property
-    def max_mem_usage(self):
-        return self.__max_mem_usage
-
-    @max_mem_usage.setter
-    def max_mem_usage(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__max_mem_usage = val
-        return
-
-    @property
-    def swap_usage(self):
-        return self.__swap_usage
-
-    @swap_usage.setter
-    def swap_usage(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__swap_usage = val
-        return
-
-    @property
-    def read_io_stats(self):
-        return self.__read_io_stats
-
-    @read_io_stats.setter
-    def read_io_stats(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__read_io_stats = val
-        return
-
-    @property
-    def write_io_stats(self):
-        return self.__write_io_stats
-
-    @write_io_stats.setter
-    def write_io_stats(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__write_io_stats = val
-        return
-
-    @property
-    def sync_io_stats(self):
-        return self.__sync_io_stats
-
-    @sync_io_stats.setter
-    def sync_io_stats(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__sync_io_stats = val
-        return
-
-    @property
-    def async_io_stats(self):
-        return self.__async_io_stats
-
-    @async_io_stats.setter
-    def async_io_stats(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__async_io_stats = val
-        return
-
-    @property
-    def total_io_stats(self):
-        return self.__total_io_stats
-
-    @total_io_stats.setter
-    def total_io_stats(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__total_io_stats = val
-        return
-
-    @property
-    def outputs(self):
-        return self.__outputs
+    def _set_result_fields(self, root):
+        self.outputs = [data.text for data in root.iterfind(_PATH_OUTPUT_DATA)]
+        self.traceback = [line.text for line in root.iterfind(_PATH_ERROR_LINES)]
+        return self
 
-    @outputs.setter
-    def outputs(self, val):
+    def set_job_full_result(self, input_xml_str: Union[str, bytes]):
         """
-        :param val:
-        :return: None
-        """
-        self.__outputs = val
-        return
-
-    @property
-    def response_code(self):
-        return self.__response_code
+        Sample:
+        <wps:Result xmlns:wps="http://www.opengis.net/wps/2.0"><wps:JobID>f3780917-92c0-4440-8a84-9b28c2e64fa8</wps:JobID><wps:Status>Succeeded</wps:Status><wps:Output id="output-2021-05-26T18:39:14.381083"><wps:Data>s3://s3.amazonaws.com:80/geospec-dataset-bucket-dev/malarout/dps_output/hytools_ubuntu/v-system-test-5/2021/05/26/18/39/14/381083</wps:Data></wps:Output><metrics><machine_type>c5.4xlarge</machine_type><job_duration_seconds>259.060852</job_duration_seconds></metrics></wps:Result>
+        """
+        root = _parse_xml(input_xml_str)
+        self._set_status_fields(root)
+        self._set_result_fields(root)
+        for each in root:
+            if _local(each.tag) == 'metrics':
+                self._set_metric_fields(each)
+        return self
 
-    @response_code.setter
-    def response_code(self, val):
-        """
-        :param val:
-        :return: None
-        """
-        self.__response_code = val
-        return
+    def _public_items(self):
+        yield 'job_id', self.id
+        for name in _PUBLIC_SLOTS:
+            yield name, getattr(self, name)
+        yield 'outputs', self.outputs or []
 
-    @property
-    def error_details(self):
-        return self.__error_details
+    def __str__(self):
+        # Formatted like str() of a dict, without building the dict first
+        return '{' + ', '.join('{!r}: {!r}'.format(name, value) for name, value in self._public_items()) + '}'
 
-    @error_details.setter
-    def error_details(self, val):
+    def to_json(self):
         """
-        :param val:
-        :return: None
+        Serialize the job's public attributes (the fields shown by str(job)) as a JSON string
+        :return: JSON string
         """
-        self.__error_details = val
-        return
+        return _json_dumps(dict(self._public_items()))
 
-    @property
-    def metrics(self):
-        return self.__metrics
+    __repr__ = __str__
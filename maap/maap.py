@@ -4,13 +4,21 @@ import boto3
 import uuid
 import urllib.parse
 import os
+import requests
 import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from itertools import islice
 
 import importlib_resources as resources
-import requests
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotocoreConfig
 from maap.Result import Collection, Granule, Result
 from maap.config_reader import MaapConfig
-from maap.dps.dps_job import DPSJob
+from maap.dps.dps_job import DPSJob, _FINAL_STATUSES
 from maap.utils import requests_utils
 from maap.utils.Presenter import Presenter
 from maap.utils.CMR import CMR
@@ -22,9 +30,115 @@ from maap.dps.DpsHelper import DpsHelper
 from maap.utils import endpoints
 from maap.utils import job
 
+try:
+    import orjson
+
+    def _json_body(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _json_body(obj):
+        return json.dumps(obj).encode('utf-8')
+
 logger = logging.getLogger(__name__)
 
-s3_client = boto3.client('s3')
+# Part uploads in flight across all files, which is also the size of the S3 client's connection pool
+_S3_MAX_CONCURRENCY = max(10, (os.cpu_count() or 1) * 2)
+# uploadFiles sends up to this many files at once, splitting _S3_MAX_CONCURRENCY between them
+_S3_MAX_CONCURRENT_FILES = 8
+# Use the CRT transfer client whenever awscrt is installed (pip install "boto3[crt]"), else let boto3 decide
+try:
+    from boto3.s3.transfer import HAS_CRT, has_minimum_crt_version
+
+    _S3_TRANSFER_CLIENT = 'crt' if HAS_CRT and has_minimum_crt_version((0, 19, 18)) else 'auto'
+except Exception:
+    _S3_TRANSFER_CLIENT = 'auto'
+
+
+@lru_cache(maxsize=8)
+def _s3_transfer_config(max_concurrency):
+    return TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=max_concurrency,
+        use_threads=True,
+        preferred_transfer_client=_S3_TRANSFER_CLIENT,
+    )
+
+
+# Seconds a getQueues/listAlgorithms or describeAlgorithm response is reused before the API is asked again
+_LISTING_CACHE_TTL = 300
+_DESCRIBE_CACHE_TTL = 60
+
+
+def _copy_response(response):
+    copy = requests.Response()
+    copy.status_code = response.status_code
+    copy.headers = requests.structures.CaseInsensitiveDict(response.headers)
+    copy._content = response.content
+    copy.url = response.url
+    copy.encoding = response.encoding
+    copy.reason = response.reason
+    copy.request = response.request
+    return copy
+
+
+# Seconds between two polls of the jobs passed to MAAP.watchJob
+_WATCH_INTERVAL = 5.0
+
+# Job details getJobsBatch can fetch, and the DPSJob method that fetches each
+_JOB_BATCH_FIELDS = {
+    'status': DPSJob.retrieve_status,
+    'result': DPSJob.retrieve_result,
+    'metrics': DPSJob.retrieve_metrics,
+}
+
+# Legacy algorithm YAML keys and the names the algorithm registration API uses for them
+_LEGACY_ALGORITHM_KEYS = {"algo_name": "algorithm_name", "version": "code_version", "environment": "environment_name",
+                          "description": "algorithm_description", "docker_url": "docker_container_url",
+                          "inputs": "algorithm_params", "run_command": "script_command", "repository_url": "repo_url"}
+
+
+@lru_cache(maxsize=8)
+def _api_header(content_type, maap_token, proxy_ticket):
+    # Headers only depend on these values, so each combination is built once; callers receive copies
+    api_header = {'Accept': content_type, 'token': maap_token, 'Content-Type': content_type}
+
+    if proxy_ticket:
+        api_header['proxy-ticket'] = proxy_ticket
+
+    return api_header
+
+
+@lru_cache(maxsize=32)
+def _encoded_display_config(display_items):
+    return urllib.parse.urlencode(display_items)
+
+
+def _display_query(display_config):
+    # show() is usually called with the same display settings for many granules, so their encoding is reused
+    try:
+        return _encoded_display_config(tuple(display_config.items()))
+    except TypeError:
+        # Unhashable settings values are encoded on every call
+        return urllib.parse.urlencode(display_config)
+
+
+def _granule_file_name(online_access_url):
+    # The last segment of a URL path never contains a slash, so it can be used as the file name directly
+    return urllib.parse.urlparse(online_access_url).path.rsplit("/", 1)[-1]
+
+
+def _for_each(fn, ids, max_workers, wait):
+    ids = list(ids)
+    if not ids:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(ids)))
+    futures = {item: executor.submit(fn, item) for item in ids}
+    # Without waiting, the worker threads finish the queued requests on their own and then exit
+    executor.shutdown(wait=wait)
+    if not wait:
+        return futures
+    return {item: future.result() for item, future in futures.items()}
 
 
 class MAAP(object):
@@ -32,36 +146,135 @@ class MAAP(object):
     def __init__(self, maap_host=os.getenv('MAAP_API_HOST', 'api.maap-project.org')):
         self.config = MaapConfig(maap_host=maap_host)
 
-        self._CMR = CMR(self.config.indexed_attributes, self.config.page_size, self._get_api_header())
-        self._DPS = DpsHelper(self._get_api_header(), self.config.member_dps_token)
-        self.profile = Profile(self.config.member, self._get_api_header())
+        # The clients share one copy of the headers and the config's pooled session
+        api_header = self._get_api_header()
+        session = self.config.session
+        self._CMR = CMR(self.config.indexed_attributes, self.config.page_size, api_header, session)
+        self._DPS = DpsHelper(api_header, self.config.member_dps_token, session)
+        self.profile = Profile(self.config.member, api_header, session)
         self.aws = AWS(
             self.config.requester_pays,
             self.config.s3_signed_url,
             self.config.edc_credentials,
             self.config.workspace_bucket_credentials,
-            self._get_api_header()
+            api_header,
+            session
         )
-        self.secrets = Secrets(self.config.member, self._get_api_header(content_type="application/json"))
+        self.secrets = Secrets(self.config.member, self._get_api_header(content_type="application/json"), session)
+        self._s3_client = None
+        self._response_cache = {}
+        self._status_cache = {}
+        self._metrics_cache = {}
+        # Watched job ids mapped to the status of the watcher's last successful poll, None until there is one
+        self._watched_jobs = {}
+        self._watch_lock = threading.Lock()
+        self._watcher = None
+        self._stop_watching = threading.Event()
+
+    def close(self):
+        """
+        Stop watching jobs and release the pooled HTTP connections held by this client
+        """
+        self._stop_watching.set()
+        with self._watch_lock:
+            self._watched_jobs.clear()
+        self.config.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def _s3(self):
+        """
+        S3 client for uploads, created on first use so that searches never pay for boto3 credential resolution
+        """
+        if self._s3_client is None:
+            # The connection pool is sized to the transfer threads so parallel parts do not wait for a connection
+            self._s3_client = boto3.client('s3', config=BotocoreConfig(
+                max_pool_connections=_S3_MAX_CONCURRENCY,
+                retries={'max_attempts': 10, 'mode': 'adaptive'},
+            ))
+        return self._s3_client
+
+    # Endpoint URLs derived from the config, built on first use rather than on every request
+    @cached_property
+    def _queues_url(self):
+        return f"{self.config.algorithm_register.rstrip('/')}/resource"
+
+    @cached_property
+    def _mas_algo_base(self):
+        return self.config.mas_algo.rstrip('/') + '/'
+
+    @cached_property
+    def _publish_url(self):
+        return self.config.mas_algo.replace('algorithm', 'publish')
+
+    @cached_property
+    def _dps_job_base(self):
+        return self.config.dps_job.strip('/')
+
+    @cached_property
+    def _wmts_tile_url(self):
+        return f'{self.config.wmts}/GetTile'
+
+    @cached_property
+    def _wmts_capabilities_url(self):
+        return f'{self.config.wmts}/GetCapabilities'
+
+    @cached_property
+    def _tiles_url(self):
+        return f"{self.config.tiler_endpoint}/tiles/{{z}}/{{x}}/{{y}}.png"
 
     def _get_api_header(self, content_type=None):
+        # Callers get their own copy, so the cached headers cannot be changed through them
+        return dict(_api_header(content_type or self.config.content_type, self.config.maap_token,
+                                os.environ.get("MAAP_PGT")))
 
-        api_header = {'Accept': content_type if content_type else self.config.content_type, 'token': self.config.maap_token, 'Content-Type': content_type if content_type else self.config.content_type}
+    def _cached_get(self, url, ttl):
+        """
+        GET a rarely-changing API resource. A successful response is kept for ttl seconds and every caller
+        gets its own copy of it; after that the request is made conditional on its ETag, and a
+        304 Not Modified keeps the cached response for another ttl seconds.
+        """
+        now = time.monotonic()
+        cached = self._response_cache.get(url)
+        if cached is not None and cached[0] > now:
+            return _copy_response(cached[1])
 
-        if os.environ.get("MAAP_PGT"):
-            api_header['proxy-ticket'] = os.environ.get("MAAP_PGT")
+        headers = self._get_api_header()
+        if cached is not None and cached[1].headers.get('ETag'):
+            headers['If-None-Match'] = cached[1].headers['ETag']
+        logger.debug('GET request sent to %s, headers: %s', url, headers)
+        response = self.config.session.get(
+            url=url,
+            headers=headers
+        )
+        if response.status_code == 304 and cached is not None:
+            response = cached[1]
+        if response.ok:
+            self._response_cache[url] = (now + ttl, _copy_response(response))
+            return _copy_response(response)
+        return response
 
-        return api_header
+    def invalidate_cache(self):
+        """
+        Forget cached queue and algorithm responses, e.g. after registering an algorithm outside this client
+        """
+        self._response_cache.clear()
 
-    def _upload_s3(self, filename, bucket, objectKey):
+    def _upload_s3(self, filename, bucket, objectKey, max_concurrency=_S3_MAX_CONCURRENCY):
         """
         Upload file to S3, utility function useful for mocking in tests.
         :param filename (string) - local filename (and path)
         :param bucket (string) - S3 bucket to upload to
         :param objectKey (string) - S3 directory and filename to upload the local file to
+        :param max_concurrency (int) - maximum number of parts of the file uploaded at once
         :return: S3 upload_file response
         """
-        return s3_client.upload_file(filename, bucket, objectKey)
+        return self._s3.upload_file(filename, bucket, objectKey, Config=_s3_transfer_config(max_concurrency))
 
     def searchGranule(self, limit=20, **kwargs):
         """
@@ -72,12 +285,11 @@ class MAAP(object):
             :return: list of results (<Instance of Result>)
             """
         results = self._CMR.get_search_results(url=self.config.search_granule_url, limit=limit, **kwargs)
-        return [Granule(result,
-                        self.config.aws_access_key,
-                        self.config.aws_access_secret,
-                        self.config.search_granule_url,
-                        self._get_api_header(),
-                        self._DPS) for result in results][:limit]
+        # Granules only read these, so every granule shares the same objects, including one copy of the headers
+        config = self.config
+        granule_args = (config.aws_access_key, config.aws_access_secret, config.search_granule_url,
+                        self._get_api_header(), self._DPS)
+        return [Granule(result, *granule_args) for result in islice(results, limit)]
 
     def downloadGranule(self, online_access_url, destination_path=".", overwrite=False):
         """
@@ -89,9 +301,7 @@ class MAAP(object):
             :return: the file path of the download file
             """
 
-        filename = os.path.basename(urllib.parse.urlparse(online_access_url).path)
-        destination_file = filename.replace("/", "")
-        final_destination = os.path.join(destination_path, destination_file)
+        final_destination = os.path.join(destination_path, _granule_file_name(online_access_url))
 
         proxy = Result({})
         proxy._dps = self._DPS
@@ -100,6 +310,28 @@ class MAAP(object):
         # noinspection PyProtectedMember
         return proxy._getHttpData(online_access_url, overwrite, final_destination)
 
+    def downloadGranules(self, online_access_urls, destination_path=".", overwrite=False, max_workers=8):
+        """
+            Download several http Earthdata granule URLs concurrently.
+
+            :param online_access_urls: the values of the granules' http OnlineAccessURL
+            :param destination_path: use the current directory as default
+            :param overwrite: don't download by default if the target files exist
+            :param max_workers: maximum number of downloads in flight at once
+            :return: the file paths of the downloaded files, in the order of online_access_urls
+            :raises ValueError: if two URLs would be downloaded to the same file
+            """
+        online_access_urls = list(online_access_urls)
+        # Concurrent downloads to the same file would corrupt it
+        names = Counter(_granule_file_name(url) for url in online_access_urls)
+        duplicates = sorted(name for name, count in names.items() if count > 1)
+        if duplicates:
+            raise ValueError("Several URLs would be downloaded to the same file: {}".format(", ".join(duplicates)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda url: self.downloadGranule(url, destination_path, overwrite), online_access_urls
+            ))
+
     def getCallFromEarthdataQuery(self, query, variable_name='maap', limit=1000):
         """
             Generate a literal string to use for calling the MAAP API
@@ -131,29 +363,22 @@ class MAAP(object):
         :return: list of results (<Instance of Result>)
         """
         results = self._CMR.get_search_results(url=self.config.search_collection_url, limit=limit, **kwargs)
-        return [Collection(result, self.config.maap_host) for result in results][:limit]
+        return [Collection(result, self.config.maap_host) for result in islice(results, limit)]
 
     def getQueues(self):
-        url = os.path.join(self.config.algorithm_register, 'resource')
-        headers = self._get_api_header()
-        logger.debug('GET request sent to {}'.format(self.config.algorithm_register))
-        logger.debug('headers:')
-        logger.debug(headers)
-        response = requests.get(
-            url=url,
-            headers=self._get_api_header()
-        )
-        return response
+        url = self._queues_url
+        return self._cached_get(url, _LISTING_CACHE_TTL)
 
     def registerAlgorithm(self, arg):
-        logger.debug('Registering algorithm with args ')
-        if type(arg) is dict:
-            arg = json.dumps(arg)
-        logger.debug(arg)
+        if isinstance(arg, (dict, list)):
+            # Sent as bytes, so requests has nothing left to encode
+            arg = _json_body(arg)
+        logger.debug('Registering algorithm with args %s', arg)
         response = requests_utils.make_request(url=self.config.algorithm_register, config=self.config,
                                                content_type='application/json', request_type=requests_utils.POST,
                                                data=arg)
-        logger.debug('POST request sent to {}'.format(self.config.algorithm_register))
+        logger.debug('POST request sent to %s', self.config.algorithm_register)
+        self.invalidate_cache()
         return response
 
     def register_algorithm_from_yaml_file(self, file_path):
@@ -162,102 +387,213 @@ class MAAP(object):
 
     def register_algorithm_from_yaml_file_backwards_compatible(self, file_path):
         algo_yaml = algorithm_utils.read_yaml_file(file_path)
-        key_map = {"algo_name": "algorithm_name", "version": "code_version", "environment": "environment_name",
-                   "description": "algorithm_description", "docker_url": "docker_container_url",
-                   "inputs": "algorithm_params", "run_command": "script_command", "repository_url": "repo_url"}
-        output_config = {}
-        for key, value in algo_yaml.items():
-            if key in key_map:
-                if key == "inputs":
-                    inputs = []
-                    for argument in value:
-                        inputs.append({"field": argument.get("name"), "download": argument.get("download")})
-                    output_config.update({"algorithm_params": inputs})
-                else:
-                    output_config.update({key_map.get(key): value})
-            else:
-                output_config.update({key: value})
-        logger.debug("Registering with config %s " % json.dumps(output_config))
-        return self.registerAlgorithm(json.dumps(output_config))
+        output_config = {_LEGACY_ALGORITHM_KEYS.get(key, key): value for key, value in algo_yaml.items()}
+        if "inputs" in algo_yaml:
+            # Replaces the renamed entry in place, so the config keeps the YAML's key order
+            output_config["algorithm_params"] = [
+                {"field": argument.get("name"), "download": argument.get("download")}
+                for argument in algo_yaml["inputs"]
+            ]
+        logger.debug("Registering with config %s", output_config)
+        return self.registerAlgorithm(output_config)
 
     def listAlgorithms(self):
-        url = self.config.mas_algo
-        headers = self._get_api_header()
-        logger.debug('GET request sent to {}'.format(url))
-        logger.debug('headers:')
-        logger.debug(headers)
-        response = requests.get(
-            url=url,
-            headers=headers
-        )
-        return response
+        return self._cached_get(self.config.mas_algo, _LISTING_CACHE_TTL)
 
     def describeAlgorithm(self, algoid):
-        url = os.path.join(self.config.mas_algo, algoid)
-        headers = self._get_api_header()
-        logger.debug('GET request sent to {}'.format(url))
-        logger.debug('headers:')
-        logger.debug(headers)
-        response = requests.get(
-            url=url,
-            headers=headers
-        )
-        return response
+        url = self._mas_algo_base + algoid
+        return self._cached_get(url, _DESCRIBE_CACHE_TTL)
+
+    def describeAlgorithms(self, algoids, max_workers=8):
+        """
+        Describe several algorithms concurrently over the shared connection pool
+        :param algoids: algorithm ids, as passed to describeAlgorithm
+        :param max_workers: maximum number of requests in flight at once
+        :return: dict mapping each algorithm id to its describeAlgorithm response
+        """
+        algoids = list(algoids)
+        if not algoids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(algoids))) as executor:
+            return dict(zip(algoids, executor.map(self.describeAlgorithm, algoids)))
 
     def publishAlgorithm(self, algoid):
-        url = self.config.mas_algo.replace('algorithm', 'publish')
+        url = self._publish_url
         headers = self._get_api_header()
         body = { "algo_id": algoid}
-        logger.debug('POST request sent to {}'.format(url))
-        logger.debug('headers:')
-        logger.debug(headers)
-        logger.debug('body:')
-        logger.debug(body)
-        response = requests.post(
+        logger.debug('POST request sent to %s, headers: %s, body: %s', url, headers, body)
+        response = self.config.session.post(
             url=url,
             headers=headers,
             data=body
         )
+        self.invalidate_cache()
         return response
 
     def deleteAlgorithm(self, algoid):
-        url = os.path.join(self.config.mas_algo, algoid)
+        url = self._mas_algo_base + algoid
         headers = self._get_api_header()
-        logger.debug('DELETE request sent to {}'.format(url))
-        logger.debug('headers:')
-        logger.debug(headers)
-        response = requests.delete(
+        logger.debug('DELETE request sent to %s, headers: %s', url, headers)
+        response = self.config.session.delete(
             url=url,
             headers=headers
         )
+        self.invalidate_cache()
         return response
 
+    def deleteAlgorithms(self, algoids, max_workers=8, wait=True):
+        """
+        Delete several algorithms concurrently over the shared connection pool
+        :param algoids: algorithm ids, as passed to deleteAlgorithm
+        :param max_workers: maximum number of requests in flight at once
+        :param wait: if False, return at once while the deletions continue in the background
+        :return: dict mapping each algorithm id to its deleteAlgorithm response, or to a Future of it if not waiting
+        """
+        return _for_each(self.deleteAlgorithm, algoids, max_workers, wait)
 
-    def getJob(self, jobid):
+    def _job(self, jobid):
+        # A DPSJob is slotted and cheap to build, and a fresh one per call keeps concurrent callers independent
         job = DPSJob(self.config)
         job.id = jobid
+        return job
+
+    def getJob(self, jobid):
+        job = self._job(jobid)
         job.retrieve_attributes()
         return job
 
-    def getJobStatus(self, jobid):
-        job = DPSJob(self.config)
-        job.id = jobid
-        return job.retrieve_status()
+    def getJobStatus(self, jobid, ttl_ms=0):
+        """
+        Get the status of a DPS job
+        :param jobid: job id
+        :param ttl_ms: if positive, reuse a status fetched less than this many milliseconds ago; a finished job's
+                       status is reused indefinitely. A job passed to watchJob is answered from the watcher's last
+                       poll while the watcher is running and that poll succeeded.
+        :return: job status
+        """
+        watcher = self._watcher
+        if watcher is not None and watcher.is_alive():
+            watched = self._watched_jobs.get(jobid)
+            if watched is not None:
+                return watched
+        if ttl_ms <= 0:
+            return self._job(jobid).retrieve_status()
+        cached = self._status_cache.get(jobid)
+        if cached is not None and (
+            cached[1].lower() in _FINAL_STATUSES or time.monotonic() - cached[0] < ttl_ms / 1000
+        ):
+            return cached[1]
+        status = self._job(jobid).retrieve_status()
+        if status is not None:
+            # Stamped once the response is in, so the TTL never counts time spent waiting on DPS
+            self._status_cache[jobid] = (time.monotonic(), status)
+        return status
+
+    def watchJob(self, jobid):
+        """
+        Keep a job's status fresh in the background until it finishes.
+        All watched jobs are polled together by one daemon thread, and getJobStatus answers for them from memory,
+        however many callers ask.
+        :param jobid: job id
+        """
+        with self._watch_lock:
+            self._watched_jobs.setdefault(jobid, None)
+            self._stop_watching.clear()
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch_jobs, name='maap-job-watcher', daemon=True)
+                self._watcher.start()
+
+    def unwatchJob(self, jobid):
+        """
+        Stop keeping a job's status fresh in the background
+        :param jobid: job id
+        """
+        with self._watch_lock:
+            self._watched_jobs.pop(jobid, None)
+
+    def _watch_jobs(self):
+        while True:
+            with self._watch_lock:
+                job_ids = list(self._watched_jobs)
+                if not job_ids or self._stop_watching.is_set():
+                    # Cleared under the lock, so watchJob starts a new thread whenever this one is on its way out
+                    self._watcher = None
+                    return
+            jobs = [self._job(jobid) for jobid in job_ids]
+            try:
+                statuses = DPSJob.bulk_retrieve_status(jobs)
+            except Exception:
+                # The previous answers are dropped, so getJobStatus makes regular requests until a poll succeeds
+                logger.debug('Polling watched jobs failed', exc_info=True)
+                statuses = [None] * len(jobs)
+            checked_at = time.monotonic()
+            with self._watch_lock:
+                for jobid, status in zip(job_ids, statuses):
+                    if jobid not in self._watched_jobs:
+                        # Unwatched while the poll was in flight
+                        continue
+                    if status is not None and status.lower() in _FINAL_STATUSES:
+                        del self._watched_jobs[jobid]
+                        self._status_cache[jobid] = (checked_at, status)
+                    else:
+                        self._watched_jobs[jobid] = status
+            self._stop_watching.wait(_WATCH_INTERVAL)
+
+    def getJobsBatch(self, job_ids, *, fields=('status',), max_workers=8):
+        """
+        Get details of many DPS jobs at once.
+        DPS has no batch endpoint, so the per-job requests are sent concurrently over the shared connection pool.
+        :param job_ids: job ids
+        :param fields: details to get for each job, any of 'status', 'result' and 'metrics'
+        :param max_workers: maximum number of jobs fetched at once
+        :return: dict mapping each job id, in the order given, to a dict of the requested fields
+        """
+        unknown = set(fields) - _JOB_BATCH_FIELDS.keys()
+        if unknown:
+            raise ValueError("Unknown job fields: {}. Fields must be among: {}".format(
+                ", ".join(sorted(unknown)), ", ".join(_JOB_BATCH_FIELDS)))
+        job_ids = list(job_ids)
+        if not job_ids:
+            return {}
+
+        def fetch(jobid):
+            job = self._job(jobid)
+            return {field: _JOB_BATCH_FIELDS[field](job) for field in fields}
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(job_ids))) as executor:
+            return dict(zip(job_ids, executor.map(fetch, job_ids)))
 
     def getJobResult(self, jobid):
-        job = DPSJob(self.config)
-        job.id = jobid
-        return job.retrieve_result()
+        return self._job(jobid).retrieve_result()
 
-    def getJobMetrics(self, jobid):
-        job = DPSJob(self.config)
-        job.id = jobid
-        return job.retrieve_metrics()
+    def getJobMetrics(self, jobid, ttl_ms=0):
+        """
+        Get the metrics of a DPS job
+        :param jobid: job id
+        :param ttl_ms: if positive, reuse metrics fetched less than this many milliseconds ago
+        :return: job metrics
+        """
+        if ttl_ms <= 0:
+            return self._job(jobid).retrieve_metrics()
+        cached = self._metrics_cache.get(jobid)
+        if cached is not None and time.monotonic() - cached[0] < ttl_ms / 1000:
+            return cached[1]
+        metrics = self._job(jobid).retrieve_metrics()
+        self._metrics_cache[jobid] = (time.monotonic(), metrics)
+        return metrics
 
     def cancelJob(self, jobid):
-        job = DPSJob(self.config)
-        job.id = jobid
-        return job.cancel_job()
+        return self._job(jobid).cancel_job()
+
+    def cancelJobs(self, jobids, max_workers=8, wait=True):
+        """
+        Cancel several DPS jobs concurrently over the shared connection pool
+        :param jobids: job ids
+        :param max_workers: maximum number of requests in flight at once
+        :param wait: if False, return at once while the cancellations continue in the background
+        :return: dict mapping each job id to its cancelJob response, or to a Future of it if not waiting
+        """
+        return _for_each(self.cancelJob, jobids, max_workers, wait)
 
     def listJobs(self, username=None, *,
                        algo_id=None, 
@@ -293,21 +629,99 @@ class MAAP(object):
             ValueError: If username is not provided and cannot be obtained from the user's profile.
             ValueError: If either algo_id or version is provided, but not both.
         """
-        if username is None and self.profile is not None and 'username' in self.profile.account_info().keys():
-            username = self.profile.account_info()['username']
+        url, params = self._list_jobs_request(username, algo_id=algo_id, end_time=end_time,
+                                              get_job_details=get_job_details, offset=offset, page_size=page_size,
+                                              queue=queue, start_time=start_time, status=status, tag=tag,
+                                              version=version)
+        headers = self._get_api_header()
+        logger.debug('GET request sent to %s, headers: %s', url, headers)
+        response = self.config.session.get(
+            url=url,
+            headers=headers,
+            params=params,
+        )
+        return response
+
+    def iterJobs(self, username=None, *, page_size=100, prefetch=2, **filters):
+        """
+        Iterate over all of a user's jobs that match the filters, page by page.
+        While one page is being consumed, up to prefetch following pages are already being requested.
+
+        Args:
+            username (str, optional): Platform user. If no username is provided, the profile username will be used.
+            page_size (int, optional): Number of jobs requested per page. Default is 100.
+            prefetch (int, optional): Number of pages requested ahead of the one being consumed. Default is 2.
+            **filters: Any of the listJobs query parameters, e.g. status, algo_id and version, or offset to start from.
+
+        Yields:
+            dict: Each job, in the order DPS lists them.
+
+        Raises:
+            ValueError: As for listJobs.
+            requests.HTTPError: If DPS fails to return a page.
+        """
+        offset = filters.pop('offset', 0)
+        url, params = self._list_jobs_request(username, page_size=page_size, **filters)
+        headers = self._get_api_header()
+
+        def fetch(page_offset):
+            logger.debug('GET request sent to %s, headers: %s', url, headers)
+            response = self.config.session.get(url=url, headers=headers, params=dict(params, offset=page_offset))
+            response.raise_for_status()
+            page = response.json()
+            return page.get('jobs', []) if isinstance(page, dict) else page
+
+        with ThreadPoolExecutor(max_workers=prefetch + 1) as executor:
+            pages = deque(executor.submit(fetch, offset + i * page_size) for i in range(prefetch + 1))
+            next_offset = offset + (prefetch + 1) * page_size
+            while pages:
+                jobs = pages.popleft().result()
+                if len(jobs) < page_size:
+                    # Last page: anything still prefetched lies beyond it
+                    for pending in pages:
+                        pending.cancel()
+                    yield from jobs
+                    return
+                pages.append(executor.submit(fetch, next_offset))
+                next_offset += page_size
+                yield from jobs
+
+    def _list_jobs_request(self, username=None, *,
+                           algo_id=None,
+                           end_time=None,
+                           get_job_details=True,
+                           offset=0,
+                           page_size=10,
+                           queue=None,
+                           start_time=None,
+                           status=None,
+                           tag=None,
+                           version=None):
+        """
+        Validate listJobs' arguments and build the URL and query parameters of the request
+        :return: (url, params)
+        """
+        if username is None and self.profile is not None:
+            info = self.profile.account_info()
+            if info and 'username' in info:
+                username = info['username']
 
         if username is None:
             raise ValueError("Unable to determine username from profile. Please provide a username.")
 
-        url = "/".join(
-            segment.strip("/")
-            for segment in (self.config.dps_job, username, endpoints.DPS_JOB_LIST)
-        )
+        url = f"{self._dps_job_base}/{username.strip('/')}/{endpoints.DPS_JOB_LIST}"
         
+        if (not algo_id) != (not version):
+            # Either algo_id or version was supplied as a non-empty string, but not both.
+            # Either both must be non-empty strings or both must be None.
+            raise ValueError("Either supply non-empty strings for both algo_id and version, or supply neither.")
+
+        if status is not None:
+            status = job.validate_job_status(status)
+
         params = {
             k: v
             for k, v in (
-                ("algo_id", algo_id),
                 ("end_time", end_time),
                 ("get_job_details", get_job_details),
                 ("offset", offset),
@@ -317,36 +731,15 @@ class MAAP(object):
                 ("status", status),
                 ("tag", tag),
                 ("username", username),
-                ("version", version),
             )
             if v is not None
         }
-        
-        if (not algo_id) != (not version):
-            # Either algo_id or version was supplied as a non-empty string, but not both.
-            # Either both must be non-empty strings or both must be None.
-            raise ValueError("Either supply non-empty strings for both algo_id and version, or supply neither.")
 
         # DPS requests use 'job_type', which is a concatenation of 'algo_id' and 'version'
         if algo_id and version:
             params['job_type'] = f"{algo_id}:{version}"
 
-        algo_id = params.pop('algo_id', None)
-        version = params.pop('version', None)
-
-        if status is not None:
-            params['status'] = job.validate_job_status(status)
-
-        headers = self._get_api_header()
-        logger.debug('GET request sent to {}'.format(url))
-        logger.debug('headers:')
-        logger.debug(headers)
-        response = requests.get(
-            url=url,
-            headers=headers,
-            params=params,
-        )
-        return response
+        return url, params
 
     def submitJob(self, identifier, algo_id, version, queue, retrieve_attributes=False, **kwargs):
         response = self._DPS.submit_job(request_url=self.config.dps_job,
@@ -357,7 +750,7 @@ class MAAP(object):
             if retrieve_attributes:
                 job.retrieve_attributes()
         except:
-            logger.debug(f"Unable to retrieve attributes for job: {job}")
+            logger.debug("Unable to retrieve attributes for job: %s", job)
         return job
 
     def uploadFiles(self, filenames):
@@ -371,22 +764,31 @@ class MAAP(object):
         prefix = self.config.s3_user_upload_dir
         uuid_dir = uuid.uuid4()
         # TODO(aimee): This should upload to a user-namespaced directory
-        for filename in filenames:
-            basename = os.path.basename(filename)
-            response = self._upload_s3(filename, bucket, f"{prefix}/{uuid_dir}/{basename}")
+        filenames = list(filenames)
+        if filenames:
+            # Several files go up at once, sharing the S3 connection pool
+            workers = min(_S3_MAX_CONCURRENT_FILES, len(filenames))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(
+                    lambda filename: self._upload_s3(
+                        filename, bucket, f"{prefix}/{uuid_dir}/{os.path.basename(filename)}",
+                        max_concurrency=max(1, _S3_MAX_CONCURRENCY // workers),
+                    ),
+                    filenames,
+                ))
         return f"Upload file subdirectory: {uuid_dir} (keep a record of this if you want to share these files with other users)"
 
     def _get_browse(self, granule_ur):
-        response = requests.get(
-            url=f'{self.config.wmts}/GetTile',
+        response = self.config.session.get(
+            url=self._wmts_tile_url,
             params=dict(granule_ur=granule_ur),
             headers=dict(Accept='application/json')
         )
         return response
 
     def _get_capabilities(self, granule_ur):
-        response = requests.get(
-            url=f'{self.config.wmts}/GetCapabilities',
+        response = self.config.session.get(
+            url=self._wmts_capabilities_url,
             params=dict(granule_ur=granule_ur),
             headers=dict(Accept='application/json')
         )
@@ -396,12 +798,18 @@ class MAAP(object):
         from mapboxgl.viz import RasterTilesViz
 
         granule_ur = granule['Granule']['GranuleUR']
-        browse_file = json.loads(self._get_browse(granule_ur).text)['browse']
-        capabilities = json.loads(self._get_capabilities(granule_ur).text)['body']
+        # The two WMTS requests are independent, so they are sent concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            browse = executor.submit(self._get_browse, granule_ur)
+            capabilities = executor.submit(self._get_capabilities, granule_ur)
+            browse_file = browse.result().json()['browse']
+            capabilities = capabilities.result().json()['body']
         presenter = Presenter(capabilities, display_config)
-        query_params = dict(url=browse_file, **presenter.display_config)
-        qs = urllib.parse.urlencode(query_params)
-        tiles_url = f"{self.config.tiler_endpoint}/tiles/{{z}}/{{x}}/{{y}}.png?{qs}"
+        qs = urllib.parse.urlencode({'url': browse_file})
+        display_query = _display_query(presenter.display_config)
+        if display_query:
+            qs = f"{qs}&{display_query}"
+        tiles_url = f"{self._tiles_url}?{qs}"
         viz = RasterTilesViz(
             tiles_url,
             height='800px',
@@ -1,20 +1,28 @@
 from maap.Dictlist import Dictlist
 import requests
-import xml.etree.ElementTree as ET
 from maap.xmlParser import XmlDictConfig
+from maap.utils.xml_utils import fromstring
 import logging
 from urllib import parse
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Result sets up to this size are fetched by page_num, several pages at once; larger ones use search-after
+_MAX_PAGED_RESULTS = 2000
+_MAX_CONCURRENT_PAGES = 8
 
 
 class CMR:
     """
     Functions used for CMR API interfacing
     """
-    def __init__(self, indexed_attributes, page_size, api_header):
+    def __init__(self, indexed_attributes, page_size, api_header, session=None):
         self._indexed_attributes = indexed_attributes
-        self._page_size = page_size
+        # MAAP_CMR_PAGE_SIZE reaches the config as a string
+        self._page_size = int(page_size)
         self._api_header = api_header
+        self._session = session if session is not None else requests.Session()
         self._logger = logging.getLogger(__name__)
 
     def get_search_results(self, url, limit, **kwargs):
@@ -27,33 +35,66 @@ class CMR:
         """
         self._logger.info("======== Waiting for response ========")
 
-        page_num = 1
-        results = []
-        while len(results) < limit:
-            parms = self._get_search_params(**kwargs)
-
-            response = requests.get(
-                url=url,
-                params=dict(parms, page_num=page_num, page_size=self._page_size),
-                headers=self._api_header
-            )
-            unparsed_page = self._prepare_cmr_response(response)
-            page = ET.XML(unparsed_page)
-
-            empty_page = True
-            for child in list(page):
-                if child.tag == 'result':
-                    results.append(XmlDictConfig(child))
-                    empty_page = False
-                elif child.tag == 'error':
-                    raise ValueError('Bad search response: {}'.format(unparsed_page))
-
-            if empty_page:
-                break
+        parms = self._get_search_params(**kwargs)
+        # Pages never need to be larger than the limit; the size stays fixed so page_num offsets line up
+        page_size = min(self._page_size, limit)
+
+        response, results, hits = self._get_page(url, dict(parms, page_num=1, page_size=page_size), self._api_header)
+        wanted = min(hits, limit) if hits is not None else None
+        if results and len(results) < limit and wanted is not None and wanted <= _MAX_PAGED_RESULTS:
+            # The first page tells us how many pages remain, so fetch them all at once, keeping their order
+            page_count = -(-wanted // page_size)
+            if page_count > 1:
+                with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_PAGES, page_count - 1)) as executor:
+                    pages = executor.map(
+                        lambda page_num: self._get_page(
+                            url, dict(parms, page_num=page_num, page_size=page_size), self._api_header
+                        )[1],
+                        range(2, page_count + 1),
+                    )
+                    for page in pages:
+                        results.extend(page)
+            del results[limit:]
+            return results
+
+        page_num = 2
+        search_after = response.headers.get('CMR-Search-After')
+        while results and len(results) < limit:
+            params = dict(parms, page_size=page_size)
+            headers = self._api_header
+            if search_after:
+                # search-after is not capped at 2000 results, and cannot be combined with page_num
+                headers = dict(headers, **{'CMR-Search-After': search_after})
             else:
-                page_num += 1
+                params['page_num'] = page_num
+            response, page, _ = self._get_page(url, params, headers)
+            search_after = response.headers.get('CMR-Search-After')
+            if not page:
+                break
+            results.extend(page)
+            page_num += 1
+        del results[limit:]
         return results
 
+    def _get_page(self, url, params, headers):
+        """
+        Request one page of search results
+        :return: the response, the page's results and the total hit count CMR reported (None if it did not)
+        """
+        response = self._session.get(url=url, params=params, headers=headers)
+        unparsed_page = self._prepare_cmr_response(response)
+        page = fromstring(unparsed_page)
+
+        results = []
+        for child in page:
+            if child.tag == 'result':
+                results.append(XmlDictConfig(child))
+            elif child.tag == 'error':
+                raise ValueError('Bad search response: {}'.format(unparsed_page))
+
+        hits = response.headers.get('CMR-Hits') or page.findtext('hits')
+        return response, results, int(hits) if hits else None
+
     def _prepare_cmr_response(self, response):
 
         cmr_output = response.text[1:-2].replace("\\", "")
@@ -112,26 +153,7 @@ class CMR:
             :param limit: the max records to return
             :return: string in the form of a MAAP API call
             """
-        y = json.loads(query)
-
-        params = []
-
-        for key, value in y.items():
-            if key.endswith("_h"):
-                params.append(key[:-2] + "=\"" + "|".join(value) + "\"")
-            elif key == "bounding_box":
-                params.append(key + "=\"" + value + "\"")
-            elif key == "p":
-                params.append("collection_concept_id=\"" + value.replace("!", "|") + "\"")
-            elif key == "pg":
-                params.append("readable_granule_name=\"" + '|'.join(value[0]['readable_granule_name'])
-                              .replace('"', '\\"') + "\"")
-
-        params.append("limit=" + str(limit))
-
-        result = variable_name + ".searchGranule(" + ", ".join(params) + ")"
-
-        return result
+        return _granule_call_from_earthdata_request(query, variable_name, limit)
 
     def generateCallFromEarthDataQueryString(self, search_url, variable_name='maap', limit=1000, search='granule'):
         """
@@ -144,31 +166,61 @@ class CMR:
             :return: string in the form of a MAAP API call
             """
 
-        params = []
-        query = parse.parse_qsl(parse.urlsplit(search_url).query)
-
-        i = 0
-        for param in query:
-            p_key = param[0].replace('[]', '')
-            p_val = param[1]
-            p_key_assignment = p_key + "=\""
-
-            # convert any duplicate params [] into pipe-delimited values
-            # e.g.,
-            #   granules?collection_concept_id[]=C1&collection_concept_id[]=C2
-            # will be converted to
-            #   maap.searchGranule(collection_concept_id="C1|C2")
-            if any(x for x in params if x.startswith(p_key_assignment)):
-                params[i - 1] = params[i - 1].replace(p_key_assignment, p_key_assignment + p_val + "|")
-            else:
-                params.append(p_key_assignment + p_val + "\"")
-                i += 1
+        return _call_from_earthdata_query_string(search_url, variable_name, limit, search)
+
+
+# Memoised at module level so the cache does not keep CMR instances alive
+@lru_cache(maxsize=256)
+def _granule_call_from_earthdata_request(query, variable_name, limit):
+    y = json.loads(query)
+
+    params = []
+
+    for key, value in y.items():
+        if key.endswith("_h"):
+            params.append(key[:-2] + "=\"" + "|".join(value) + "\"")
+        elif key == "bounding_box":
+            params.append(key + "=\"" + value + "\"")
+        elif key == "p":
+            params.append("collection_concept_id=\"" + value.replace("!", "|") + "\"")
+        elif key == "pg":
+            params.append("readable_granule_name=\"" + '|'.join(value[0]['readable_granule_name'])
+                          .replace('"', '\\"') + "\"")
+
+    params.append("limit=" + str(limit))
 
-        params.append("limit=" + str(limit))
+    result = variable_name + ".searchGranule(" + ", ".join(params) + ")"
 
-        if search == 'granule':
-            result = variable_name + ".searchGranule(" + ", ".join(params) + ")"
+    return result
+
+
+@lru_cache(maxsize=256)
+def _call_from_earthdata_query_string(search_url, variable_name, limit, search):
+    params = []
+    query = parse.parse_qsl(parse.urlsplit(search_url).query)
+
+    i = 0
+    for param in query:
+        p_key = param[0].replace('[]', '')
+        p_val = param[1]
+        p_key_assignment = p_key + "=\""
+
+        # convert any duplicate params [] into pipe-delimited values
+        # e.g.,
+        #   granules?collection_concept_id[]=C1&collection_concept_id[]=C2
+        # will be converted to
+        #   maap.searchGranule(collection_concept_id="C1|C2")
+        if any(x for x in params if x.startswith(p_key_assignment)):
+            params[i - 1] = params[i - 1].replace(p_key_assignment, p_key_assignment + p_val + "|")
         else:
-            result = variable_name + ".searchCollection(" + ", ".join(params) + ")"
+            params.append(p_key_assignment + p_val + "\"")
+            i += 1
+
+    params.append("limit=" + str(limit))
+
+    if search == 'granule':
+        result = variable_name + ".searchGranule(" + ", ".join(params) + ")"
+    else:
+        result = variable_name + ".searchCollection(" + ", ".join(params) + ")"
 
-        return result
+    return result
@@ -1,5 +1,5 @@
 # Valid job statuses (loosely based on OGC job status types)
-JOB_STATUSES = {'Accepted', 'Running', 'Succeeded', 'Failed', 'Dismissed', 'Deduped', 'Offline'}
+JOB_STATUSES = frozenset({'Accepted', 'Running', 'Succeeded', 'Failed', 'Dismissed', 'Deduped', 'Offline'})
 
 def validate_job_status(status):
     '''
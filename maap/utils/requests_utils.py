@@ -1,8 +1,10 @@
 import os
+from functools import lru_cache
 from maap.config_reader import MaapConfig
 import logging
 import requests
 from enum import Enum
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -21,22 +23,32 @@ PUT = HTTPMethod.PUT
 DELETE = HTTPMethod.DELETE
 
 
-def generate_dps_headers(config: MaapConfig, content_type=None):
+@lru_cache(maxsize=32)
+def _dps_headers(accept, maap_token, content_type, proxy_ticket):
+    # Headers only depend on these values, so each combination is built once and shared; callers must not mutate it
     api_header = {
-        'Accept': config.content_type,
+        'Accept': accept,
     }
     if content_type:
         api_header['Content-Type'] = content_type
-    if config.maap_token.lower().startswith('basic') or config.maap_token.lower().startswith('bearer'):
-        api_header['Authorization'] = config.maap_token
+    if maap_token.lower().startswith('basic') or maap_token.lower().startswith('bearer'):
+        api_header['Authorization'] = maap_token
     else:
-        api_header['token'] = config.maap_token
+        api_header['token'] = maap_token
 
-    if os.environ.get("MAAP_PGT"):
-        api_header['proxy-ticket'] = os.environ.get("MAAP_PGT")
+    if proxy_ticket:
+        api_header['proxy-ticket'] = proxy_ticket
     return api_header
 
 
+def _cached_dps_headers(config: MaapConfig, content_type=None):
+    return _dps_headers(config.content_type, config.maap_token, content_type, os.environ.get("MAAP_PGT"))
+
+
+def generate_dps_headers(config: MaapConfig, content_type=None):
+    return dict(_cached_dps_headers(config, content_type))
+
+
 def check_response(dps_response):
     # if dps_response.status_code not in [200, 201]:
     #     raise RuntimeError('response is not 200 or 201. code: {}. details: {}'.format(dps_response.status_code,
@@ -46,16 +58,19 @@ def check_response(dps_response):
 
 # TODO: Explore consolidating all requests from maap-py into this class
 def make_request(url, config: MaapConfig, content_type=None, request_type: HTTPMethod = HTTPMethod.GET,
-                 self_signed=False, **kwargs):
-    headers = generate_dps_headers(config, content_type)
-    logger.debug(f"{request_type} request sent to {url}")
-    logger.debug('headers:')
-    logger.debug(headers)
+                 self_signed=False, session: Optional[requests.Session] = None,
+                 extra_headers: Optional[dict] = None, **kwargs):
+    headers = _cached_dps_headers(config, content_type)
+    if extra_headers:
+        headers = {**headers, **extra_headers}
+    logger.debug('%s request sent to %s, headers: %s', request_type, url, headers)
     if request_type not in {POST, GET}:
         # TODO: Add support for request type DELETE
         raise NotImplementedError(f"Request type {request_type} not supported")
     else:
-        return requests.request(
+        # Reuse pooled connections: the caller's session if supplied, otherwise the one shared through the config
+        requester = session if session is not None else config.session
+        return requester.request(
             method=request_type.value,
             url=url,
             verify=not self_signed,
@@ -65,5 +80,7 @@ def make_request(url, config: MaapConfig, content_type=None, request_type: HTTPM
 
 
 def make_dps_request(url, config: MaapConfig, content_type=None, request_type: HTTPMethod = HTTPMethod.GET,
-                     self_signed=False, **kwargs):
-    return check_response(make_request(url, config, content_type, request_type, self_signed, **kwargs))
+                     self_signed=False, session: Optional[requests.Session] = None,
+                     extra_headers: Optional[dict] = None, **kwargs):
+    return check_response(make_request(url, config, content_type, request_type, self_signed, session, extra_headers,
+                                       **kwargs))
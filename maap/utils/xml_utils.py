@@ -0,0 +1,51 @@
+import threading
+
+_etree = None
+_parsers = threading.local()
+
+
+def etree():
+    """
+    ElementTree implementation used to parse MAAP API responses: lxml when installed, else the standard library.
+    Imported on first use, so importing maap does not pay for an XML library that may never be needed.
+    """
+    global _etree
+    if _etree is None:
+        try:
+            from lxml import etree as module
+        except ImportError:
+            import xml.etree.ElementTree as module
+        _etree = module
+    return _etree
+
+
+def fromstring(data):
+    """
+    Parse an XML document into its root element.
+    A str document is encoded first, since lxml rejects str input that carries an encoding declaration.
+    With lxml, each thread reuses one parser rather than building a new one per document.
+    :param data: document bytes or str
+    :return: root element
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    module = etree()
+    if module.__name__ != 'lxml.etree':
+        return module.fromstring(data)
+    parser = getattr(_parsers, 'parser', None)
+    if parser is None:
+        parser = _parsers.parser = module.XMLParser(resolve_entities=False)
+    return module.fromstring(data, parser)
+
+
+def iterparse(source, events=('end',)):
+    """
+    Parse an XML document incrementally, with the same settings as fromstring.
+    :param source: binary file object
+    :param events: events to report
+    :return: iterator of (event, element) pairs
+    """
+    module = etree()
+    if module.__name__ != 'lxml.etree':
+        return module.iterparse(source, events=events)
+    return module.iterparse(source, events=events, resolve_entities=False)
@@ -3,10 +3,41 @@ from typing import Iterable
 
 import boto3
 import pytest
+import responses
 from moto import mock_aws
 from mypy_boto3_s3.client import S3Client
 
+from maap import config_reader
 from maap.AWS import AWS
+from maap.config_reader import MaapConfig
+from maap.maap import MAAP
+
+MAAP_HOST = "https://api.maap-project.org"
+CLIENT_CONFIG = {
+    "service": {
+        "maap_api_root": f"{MAAP_HOST}/api",
+        "maap_token": "abc",
+        "tiler_endpoint": "https://titiler.maap-project.org",
+    },
+    "maap_endpoint": {
+        "algorithm_register": "mas/algorithm",
+        "algorithm_build": "dps/algorithm/build",
+        "mas_algo": "mas/algorithm",
+        "dps_job": "dps/job",
+        "member_dps_token": "members/dps/userIdToken",
+        "requester_pays": "members/self/awsAccess",
+        "edc_credentials": "members/self/awsAccess/edcCredentials/{endpoint_uri}",
+        "workspace_bucket_credentials": "members/self/awsAccess/workspaceBucket",
+        "s3_signed_url": "members/self/presignedUrlS3/{bucket}/{key}",
+        "wmts": "wmts",
+        "member": "members/self",
+        "search_granule_url": "cmr/granules",
+        "search_collection_url": "cmr/collections",
+    },
+    "search": {
+        "indexed_attributes": [],
+    },
+}
 
 
 @pytest.fixture(scope="session")
@@ -34,3 +65,26 @@ def aws_credentials() -> None:
 def s3(aws_credentials) -> Iterable[S3Client]:
     with mock_aws():
         yield boto3.client("s3", region_name="us-east-1")
+
+
+@pytest.fixture(scope="function")
+def config(monkeypatch) -> Iterable[MaapConfig]:
+    """MaapConfig read from a mocked MAAP API environment config."""
+    monkeypatch.delenv("MAAP_API_CONFIG_ENDPOINT", raising=False)
+    monkeypatch.setenv("MAAP_S3_USER_UPLOAD_BUCKET", "upload-bucket")
+    monkeypatch.setenv("MAAP_S3_USER_UPLOAD_DIR", "staging")
+    config_reader._get_client_config.cache_clear()
+    with responses.RequestsMock() as mock:
+        mock.get(url=f"{MAAP_HOST}/api/environment/config", json=CLIENT_CONFIG)
+        config = MaapConfig(maap_host=MAAP_HOST)
+    yield config
+    config.close()
+    config_reader._get_client_config.cache_clear()
+
+
+@pytest.fixture(scope="function")
+def maap(config) -> Iterable[MAAP]:
+    """MAAP client for the mocked MAAP API; its config is served from the cache the config fixture filled."""
+    client = MAAP(maap_host=config.maap_host)
+    yield client
+    client.close()
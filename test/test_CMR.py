@@ -1,5 +1,10 @@
 from unittest import TestCase
+
+import responses
+
 from maap.maap import MAAP
+from maap.utils import CMR as CMR_module
+from maap.utils.CMR import CMR
 
 
 class TestCMR(TestCase):
@@ -92,3 +97,88 @@ class TestCMR(TestCase):
         url = results[0].getS3Url()
         self.assertTrue(url.startswith("s3"))
 
+
+
+CMR_PAGE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<results><hits>1</hits><took>5</took>'
+    '<result concept-id="G1200110820-NASA_MAAP" format="application/echo10+xml">'
+    '<Granule><GranuleUR>uavsar_AfriSAR_v1-cov_lopenp_14043_16008_140_001_160225-geo_cov_4-4.bin</GranuleUR></Granule>'
+    '</result></results>'
+)
+
+
+@responses.activate
+def test_get_search_results():
+    url = "https://api.maap-project.org/api/cmr/granules"
+    # The MAAP API returns the CMR XML as a quoted, escaped string
+    responses.get(url=url, body='"' + CMR_PAGE.replace('"', '\\"') + '"\n',
+                  match=[responses.matchers.query_param_matcher({"granule_ur": "a.bin", "page_num": "1", "page_size": "10"})])
+    responses.get(url=url, body='"<results><hits>1</hits></results>"\n',
+                  match=[responses.matchers.query_param_matcher({"granule_ur": "a.bin", "page_num": "2", "page_size": "10"})])
+
+    results = CMR([], 20, {}).get_search_results(url, limit=10, granule_ur="a.bin")
+    assert len(results) == 1
+    assert results[0]["concept-id"] == "G1200110820-NASA_MAAP"
+    assert results[0]["Granule"]["GranuleUR"].endswith("geo_cov_4-4.bin")
+
+
+@responses.activate
+def test_get_search_results_stops_at_limit():
+    url = "https://api.maap-project.org/api/cmr/granules"
+    page = CMR_PAGE.replace("</results>", '<result concept-id="G2-NASA_MAAP"><Granule/></result></results>')
+    responses.get(url=url, body='"' + page.replace('"', '\\"') + '"\n')
+
+    results = CMR([], 20, {}).get_search_results(url, limit=1)
+    assert [result["concept-id"] for result in results] == ["G1200110820-NASA_MAAP"]
+    assert len(responses.calls) == 1
+    assert "page_size=1" in responses.calls[0].request.url
+
+
+@responses.activate
+def test_get_search_results_search_after(monkeypatch):
+    # Too many hits to page by page_num, so the cursor is followed
+    monkeypatch.setattr(CMR_module, "_MAX_PAGED_RESULTS", 1)
+    url = "https://api.maap-project.org/api/cmr/granules"
+    body = '"' + CMR_PAGE.replace("<hits>1</hits>", "<hits>5000</hits>").replace('"', '\\"') + '"\n'
+    responses.get(url=url, body=body, headers={"CMR-Search-After": '["a", 1]'},
+                  match=[responses.matchers.query_param_matcher({"page_num": "1", "page_size": "2"})])
+    responses.get(url=url, body=body, headers={"CMR-Search-After": '["b", 2]'},
+                  match=[responses.matchers.query_param_matcher({"page_size": "2"}),
+                         responses.matchers.header_matcher({"CMR-Search-After": '["a", 1]'})])
+
+    results = CMR([], 20, {}).get_search_results(url, limit=2)
+    assert len(results) == 2
+
+
+def test_generateCallFromEarthDataQueryString():
+    cmr = CMR([], 20, {})
+    search_url = "https://cmr.earthdata.nasa.gov/search/granules?collection_concept_id[]=C1&bounding_box=1,2,3,4"
+
+    call = cmr.generateCallFromEarthDataQueryString(search_url, limit=5)
+    assert call == 'maap.searchGranule(collection_concept_id="C1", bounding_box="1,2,3,4", limit=5)'
+    assert cmr.generateCallFromEarthDataQueryString(search_url, limit=5) is call
+
+
+@responses.activate
+def test_get_search_results_fetches_pages_concurrently():
+    url = "https://api.maap-project.org/api/cmr/granules"
+    for page_num in range(1, 4):
+        page = CMR_PAGE.replace("<hits>1</hits>", "<hits>3</hits>").replace("G1200110820", f"G{page_num}")
+        responses.get(url=url, body='"' + page.replace('"', '\\"') + '"\n',
+                      match=[responses.matchers.query_param_matcher({"page_num": str(page_num), "page_size": "1"})])
+
+    results = CMR([], 1, {}).get_search_results(url, limit=10)
+    assert [result["concept-id"] for result in results] == ["G1-NASA_MAAP", "G2-NASA_MAAP", "G3-NASA_MAAP"]
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_get_search_results_string_page_size():
+    url = "https://api.maap-project.org/api/cmr/granules"
+    responses.get(url=url, body='"' + CMR_PAGE.replace('"', '\\"') + '"\n',
+                  match=[responses.matchers.query_param_matcher({"page_num": "1", "page_size": "20"})])
+
+    # As read from MAAP_CMR_PAGE_SIZE
+    results = CMR([], "50", {}).get_search_results(url, limit=20)
+    assert [result["concept-id"] for result in results] == ["G1200110820-NASA_MAAP"]
@@ -0,0 +1,89 @@
+import json
+
+import responses
+
+from maap.dps.DpsHelper import DpsHelper
+
+DPS_JOB_URL = "https://api.maap-project.org/api/dps/job"
+JOB_ID = "50314f32-6099-47fa-8270-c378ac5ff83b"
+
+SUBMIT_RESPONSE_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<wps:StatusInfo xmlns:wps="http://www.opengis.net/wps/2.0">'
+    f"<wps:JobID>{JOB_ID}</wps:JobID>"
+    "<wps:Status>Accepted</wps:Status>"
+    "</wps:StatusInfo>"
+)
+
+EXCEPTION_RESPONSE_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<ows:ExceptionReport xmlns:ows="http://www.opengis.net/ows/2.0">'
+    '<ows:Exception exceptionCode="InvalidParameterValue"/>'
+    "</ows:ExceptionReport>"
+)
+
+
+def _dps_helper():
+    return DpsHelper({"Accept": "application/xml"}, "https://api.maap-project.org/api/members/dps/userImpersonationToken")
+
+
+def test_dps_helper_is_slotted():
+    helper = _dps_helper()
+    assert not hasattr(helper, "__dict__")
+    assert helper.running_in_dps is False
+
+
+def test_dps_helper_running_in_dps(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / DpsHelper.DPS_INTERNAL_FILE_DPS_TOKEN).write_text("machine-token\n")
+    (tmp_path / DpsHelper.DPS_INTERNAL_FILE_JOB).write_text(
+        json.dumps({"job_info": {"job_payload": {"payload_task_id": JOB_ID}}}, indent=2)
+    )
+
+    helper = _dps_helper()
+    assert helper.running_in_dps is True
+    assert helper.dps_machine_token == "machine-token"
+    assert helper.job_id == JOB_ID
+
+
+@responses.activate
+def test_submit_job():
+    responses.post(url=DPS_JOB_URL, body=SUBMIT_RESPONSE_XML)
+
+    result = _dps_helper().submit_job(DPS_JOB_URL, algo_id="hello-world", version="main", queue="maap-dps-worker-8gb",
+                                      config='{"bands": [1, 2]}')
+    assert result == {"status": "success", "http_status_code": 200, "job_id": JOB_ID}
+
+    body = responses.calls[0].request.body.decode("utf-8")
+    assert "<ows:Identifier>job-hello-world:main</ows:Identifier>" in body
+    assert '<wps:Input id="queue">' in body
+    assert '<wps:LiteralValue><![CDATA[{"bands": [1, 2]}]]></wps:LiteralValue>' in body
+
+
+@responses.activate
+def test_submit_job_exception():
+    responses.post(url=DPS_JOB_URL, body=EXCEPTION_RESPONSE_XML)
+
+    result = _dps_helper().submit_job(DPS_JOB_URL, algo_id="hello-world", version="main")
+    assert result["status_code"] == 400
+    assert result["result"].startswith("Exception: InvalidParameterValue")
+
+
+@responses.activate
+def test_submit_job_escapes_inputs():
+    responses.post(url=DPS_JOB_URL, body=SUBMIT_RESPONSE_XML)
+
+    _dps_helper().submit_job(DPS_JOB_URL, algo_id="hello-world", version="main", **{"a&b": "x]]>y"})
+
+    body = responses.calls[0].request.body.decode("utf-8")
+    assert '<wps:Input id="a&amp;b">' in body
+    assert "<![CDATA[x]]]]><![CDATA[>y]]>" in body
+
+
+@responses.activate
+def test_submit_job_non_ascii_input():
+    responses.post(url=DPS_JOB_URL, body=SUBMIT_RESPONSE_XML)
+
+    result = _dps_helper().submit_job(DPS_JOB_URL, algo_id="hello-world", version="main", site="Lopé")
+    assert result["status"] == "success"
+    assert "<![CDATA[Lopé]]>".encode("utf-8") in responses.calls[0].request.body
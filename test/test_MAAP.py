@@ -1,8 +1,14 @@
+import json
 from unittest import TestCase
+from maap import maap as maap_module
 from maap.maap import MAAP
+from maap.Profile import Profile
 from unittest.mock import MagicMock
 import re
 
+import pytest
+import responses
+
 
 class TestMAAP(TestCase):
     @classmethod
@@ -327,3 +333,248 @@ class TestMAAP(TestCase):
             ]
         )
 
+
+MAS_URL = "https://api.maap-project.org/api/mas/algorithm"
+DPS_JOB_URL = "https://api.maap-project.org/api/dps/job"
+JOB_ID = "f3780917-92c0-4440-8a84-9b28c2e64fa8"
+
+
+def _status_xml(job_id, status):
+    return ('<wps:StatusInfo xmlns:wps="http://www.opengis.net/wps/2.0">'
+            f'<wps:JobID>{job_id}</wps:JobID><wps:Status>{status}</wps:Status></wps:StatusInfo>')
+
+
+@responses.activate
+def test_downloadGranules(maap, tmp_path):
+    urls = [f"https://data.mydaac.earthdata.nasa.gov/path/to/granule{i}.h5" for i in range(5)]
+    for i, url in enumerate(urls):
+        responses.get(url=url, body=f"granule {i}")
+
+    paths = maap.downloadGranules(urls, str(tmp_path), max_workers=3)
+    assert paths == [str(tmp_path / f"granule{i}.h5") for i in range(5)]
+    assert [open(path).read() for path in paths] == [f"granule {i}" for i in range(5)]
+
+
+def test_downloadGranules_same_file_name(maap, tmp_path):
+    urls = ["https://data.daac-a.earthdata.nasa.gov/granule.h5", "https://data.daac-b.earthdata.nasa.gov/granule.h5"]
+
+    with pytest.raises(ValueError, match="granule.h5"):
+        maap.downloadGranules(urls, str(tmp_path))
+
+
+def test_upload_s3_creates_client_on_first_use(maap, s3, tmp_path):
+    s3.create_bucket(Bucket="upload-bucket")
+    upload = tmp_path / "upload.txt"
+    upload.write_text("hello")
+
+    maap._upload_s3(str(upload), "upload-bucket", "staging/upload.txt")
+
+    assert maap._s3_client is not None
+    assert s3.get_object(Bucket="upload-bucket", Key="staging/upload.txt")["Body"].read() == b"hello"
+
+
+@responses.activate
+def test_registerAlgorithm_serializes_config(maap):
+    responses.post(url=MAS_URL, json={"code": 200})
+    algorithm = {"algorithm_name": "hello-world", "algorithm_params": [{"field": "bands", "download": False}]}
+
+    assert maap.registerAlgorithm(algorithm).status_code == 200
+    request = responses.calls[0].request
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(request.body) == algorithm
+
+
+def test_register_algorithm_from_yaml_file_backwards_compatible(maap, tmp_path):
+    algo_yaml = tmp_path / "algo.yml"
+    algo_yaml.write_text(
+        "algo_name: hello-world\n"
+        "version: main\n"
+        "inputs:\n"
+        "  - name: bands\n"
+        "    download: false\n"
+        "queue: maap-dps-worker-8gb\n"
+    )
+    maap.registerAlgorithm = MagicMock(return_value=None)
+
+    maap.register_algorithm_from_yaml_file_backwards_compatible(str(algo_yaml))
+    config = maap.registerAlgorithm.call_args.args[0]
+    assert list(config.items()) == [
+        ("algorithm_name", "hello-world"),
+        ("code_version", "main"),
+        ("algorithm_params", [{"field": "bands", "download": False}]),
+        ("queue", "maap-dps-worker-8gb"),
+    ]
+
+
+@responses.activate
+def test_describeAlgorithm_is_cached(maap):
+    responses.get(url=f"{MAS_URL}/hello-world:main", json={"code": 200}, headers={"ETag": '"v1"'})
+    responses.get(url=f"{MAS_URL}/hello-world:main", status=304,
+                  match=[responses.matchers.header_matcher({"If-None-Match": '"v1"'})])
+
+    first = maap.describeAlgorithm("hello-world:main")
+    second = maap.describeAlgorithm("hello-world:main")
+    assert second is not first
+    assert second.status_code == 200 and second.json() == {"code": 200}
+    assert len(responses.calls) == 1
+
+    # Once expired, a 304 Not Modified keeps the cached response
+    maap._response_cache = {key: (0, response) for key, (_, response) in maap._response_cache.items()}
+    third = maap.describeAlgorithm("hello-world:main")
+    assert third.status_code == 200 and third.json() == {"code": 200}
+    assert len(responses.calls) == 2
+
+    maap.invalidate_cache()
+    assert maap._response_cache == {}
+
+
+@pytest.mark.parametrize("method, verb, url, kwargs", [
+    ("describeAlgorithms", responses.GET, MAS_URL + "/{}", {}),
+    ("deleteAlgorithms", responses.DELETE, MAS_URL + "/{}", {}),
+    ("deleteAlgorithms", responses.DELETE, MAS_URL + "/{}", {"wait": False}),
+    ("cancelJobs", responses.POST, DPS_JOB_URL + "/cancel/{}", {}),
+    ("cancelJobs", responses.POST, DPS_JOB_URL + "/cancel/{}", {"wait": False}),
+])
+@responses.activate
+def test_batch_methods(maap, method, verb, url, kwargs):
+    ids = [f"item-{i}" for i in range(4)]
+    for item in ids:
+        responses.add(verb, url=url.format(item), body=item)
+
+    answers = getattr(maap, method)(ids, max_workers=3, **kwargs)
+    assert list(answers) == ids
+    if kwargs.get("wait") is False:
+        answers = {item: future.result(timeout=5) for item, future in answers.items()}
+    # cancelJob answers with the response text, the algorithm calls with the response
+    assert [getattr(answer, "text", answer) for answer in answers.values()] == ids
+
+
+@responses.activate
+def test_getJobStatus_ttl(maap):
+    url = f"{DPS_JOB_URL}/{JOB_ID}/status"
+    responses.get(url=url, body=_status_xml(JOB_ID, "Running"))
+    responses.get(url=url, body=_status_xml(JOB_ID, "Succeeded"))
+
+    assert maap.getJobStatus(JOB_ID, ttl_ms=60000) == "Running"
+    assert maap.getJobStatus(JOB_ID, ttl_ms=60000) == "Running"
+    assert len(responses.calls) == 1
+
+    # Without a TTL the status is always fetched and not remembered; once finished it is reused for any TTL
+    assert maap.getJobStatus(JOB_ID) == "Succeeded"
+    assert maap._status_cache[JOB_ID][1] == "Running"
+    maap._status_cache[JOB_ID] = (0, "Succeeded")
+    assert maap.getJobStatus(JOB_ID, ttl_ms=1) == "Succeeded"
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_watchJob(maap, monkeypatch):
+    monkeypatch.setattr("maap.maap._WATCH_INTERVAL", 0.01)
+    url = f"{DPS_JOB_URL}/{JOB_ID}/status"
+    responses.get(url=url, body=_status_xml(JOB_ID, "Running"))
+    responses.get(url=url, body=_status_xml(JOB_ID, "Succeeded"))
+
+    maap.watchJob(JOB_ID)
+    watcher = maap._watcher
+    watcher.join(timeout=5)
+
+    # The watcher stops once the job finishes, and its last answer is served without another request
+    assert not watcher.is_alive()
+    assert maap._watched_jobs == {}
+    assert maap._watcher is None
+    calls = len(responses.calls)
+    assert maap.getJobStatus(JOB_ID, ttl_ms=1) == "Succeeded"
+    assert len(responses.calls) == calls
+
+
+@responses.activate
+def test_getJobStatus_after_close(maap, monkeypatch):
+    monkeypatch.setattr("maap.maap._WATCH_INTERVAL", 0.01)
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}/status", body=_status_xml(JOB_ID, "Running"))
+
+    maap.watchJob(JOB_ID)
+    watcher = maap._watcher
+    while maap._watched_jobs.get(JOB_ID) is None:
+        watcher.join(timeout=0.01)
+    assert maap.getJobStatus(JOB_ID) == "Running"
+
+    # Once closed, the watcher's answers are no longer used
+    maap.close()
+    watcher.join(timeout=5)
+    calls = len(responses.calls)
+    assert maap.getJobStatus(JOB_ID) == "Running"
+    assert len(responses.calls) == calls + 1
+
+
+@responses.activate
+def test_getJobsBatch(maap):
+    job_ids = [f"job-{i}" for i in range(5)]
+    for i, job_id in enumerate(job_ids):
+        responses.get(url=f"{DPS_JOB_URL}/{job_id}/status",
+                      body=_status_xml(job_id, "Running" if i % 2 else "Succeeded"))
+
+    jobs = maap.getJobsBatch(job_ids, max_workers=3)
+    assert list(jobs) == job_ids
+    assert [details["status"] for details in jobs.values()] == ["Succeeded", "Running"] * 2 + ["Succeeded"]
+
+    with pytest.raises(ValueError, match="owner"):
+        maap.getJobsBatch(job_ids, fields=("status", "owner"))
+
+
+def test_uploadFiles_uploads_every_file(maap, s3, tmp_path):
+    s3.create_bucket(Bucket="upload-bucket")
+    filenames = []
+    for i in range(3):
+        upload = tmp_path / f"upload{i}.txt"
+        upload.write_text(f"file {i}")
+        filenames.append(str(upload))
+
+    # Any iterable of file names is accepted
+    message = maap.uploadFiles(filename for filename in filenames)
+    uuid_dir = re.match("Upload file subdirectory: (\\S+)", message).group(1)
+    keys = sorted(item["Key"] for item in s3.list_objects_v2(Bucket="upload-bucket")["Contents"])
+    assert keys == [f"staging/{uuid_dir}/upload{i}.txt" for i in range(3)]
+
+
+def test_uploadFiles_shares_s3_connections(maap):
+    maap._upload_s3 = MagicMock(return_value=None)
+
+    maap.uploadFiles([f"upload{i}.txt" for i in range(4)])
+    # The files' concurrent parts together fit the S3 client's connection pool
+    concurrency = [call.kwargs["max_concurrency"] for call in maap._upload_s3.call_args_list]
+    assert len(concurrency) == 4
+    assert sum(concurrency) <= maap_module._S3_MAX_CONCURRENCY
+
+
+@responses.activate
+def test_iterJobs(maap):
+    url = f"{DPS_JOB_URL}/alice/list"
+    jobs = [{"job_id": f"job-{i}"} for i in range(5)]
+    for offset in range(0, 8, 2):
+        responses.get(url=url, json={"code": 200, "jobs": jobs[offset:offset + 2]},
+                      match=[responses.matchers.query_param_matcher({"offset": str(offset), "page_size": "2"},
+                                                                     strict_match=False)])
+
+    assert list(maap.iterJobs("alice", page_size=2, prefetch=1, status="Succeeded")) == jobs
+    assert all("status=Succeeded" in call.request.url for call in responses.calls)
+
+
+def test_list_jobs_request_params(maap):
+    url, params = maap._list_jobs_request("alice", algo_id="hello-world", version="main", status="Failed")
+    assert url == f"{DPS_JOB_URL}/alice/list"
+    assert params == {"get_job_details": True, "offset": 0, "page_size": 10, "status": "Failed",
+                      "username": "alice", "job_type": "hello-world:main"}
+
+    with pytest.raises(ValueError):
+        maap._list_jobs_request("alice", algo_id="hello-world")
+
+
+@responses.activate
+def test_list_jobs_request_username_from_profile(maap):
+    profile_url = "https://api.maap-project.org/api/members/self"
+    responses.get(url=profile_url, json={"username": "alice"})
+    maap.profile = Profile(profile_url, {"token": "abc"})
+
+    assert maap._list_jobs_request()[0] == f"{DPS_JOB_URL}/alice/list"
+    assert maap._list_jobs_request()[1]["username"] == "alice"
+    assert len(responses.calls) == 1
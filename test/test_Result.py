@@ -3,6 +3,7 @@ import re
 
 import os
 import os.path
+from types import SimpleNamespace
 import pytest
 import requests
 import responses
@@ -415,3 +416,29 @@ def test_getData_s3_with_multiple_fallbacks(tmp_path: pathlib.Path):
 
     with open(granule.getData(str(tmp_path))) as f:
         assert f.read() == "http contents"
+
+
+@responses.activate
+def test_getData_401_retries_through_maap_api(tmp_path: pathlib.Path, monkeypatch):
+    closed = []
+    close = requests.Response.close
+    monkeypatch.setattr(requests.Response, "close", lambda self: closed.append(self.status_code) or close(self))
+
+    url = f"{GRANULE_BASE_URL}/path/to/greeting.txt"
+    responses.get(url=url, status=401)
+    responses.get(url=re.compile("https://api.maap-project.org/api/cmr/granule/.*"), body="Hello")
+
+    granule = Granule(
+        metaResult={"Granule": {"OnlineAccessURLs": {"OnlineAccessURL": {"URL": url}}}},
+        awsAccessKey="",
+        awsAccessSecret="",
+        apiHeader={},
+        cmrFileUrl="https://api.maap-project.org/api/cmr/granule",
+        dps=SimpleNamespace(running_in_dps=False),
+    )
+
+    with open(granule.getData(str(tmp_path))) as f:
+        assert f.read() == "Hello"
+    # The unauthorized response is closed before the retry, not left holding its connection
+    assert closed[0] == 401
+    assert 200 in closed
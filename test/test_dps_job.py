@@ -0,0 +1,345 @@
+import json
+
+import pytest
+import requests
+import responses
+
+from maap.dps.dps_job import DPSJob, _METRIC_NAMES
+
+DPS_JOB_URL = "https://api.maap-project.org/api/dps/job"
+JOB_ID = "f3780917-92c0-4440-8a84-9b28c2e64fa8"
+
+STATUS_XML = """<?xml version="1.0" ?>
+<wps:StatusInfo xmlns:ows="http://www.opengis.net/ows/2.0" xmlns:wps="http://www.opengis.net/wps/2.0">
+    <wps:JobID>{job_id}</wps:JobID>
+    <wps:Status>{status}</wps:Status>
+</wps:StatusInfo>"""
+
+
+@pytest.fixture
+def job(config) -> DPSJob:
+    job = DPSJob(config)
+    job.id = JOB_ID
+    return job
+
+
+def test_job_attributes_are_slotted(job: DPSJob):
+    assert not hasattr(job, "__dict__")
+    with pytest.raises(AttributeError):
+        job.unknown_attribute = "value"
+
+
+def test_job_str(job: DPSJob):
+    assert job.outputs is None
+    job.set_job_metrics_result(METRICS_XML)
+    expected = {"job_id": JOB_ID, "status": None}
+    expected.update((name, getattr(job, name)) for name in _METRIC_NAMES)
+    expected.update(error_details=None, response_code=None, outputs=[])
+    assert str(job) == str(expected)
+    assert repr(job) == str(job)
+    assert json.loads(job.to_json()) == expected
+
+
+@responses.activate
+def test_wait_for_completion_polls_until_terminal(job: DPSJob):
+    for status in ("Accepted", "Running", "Succeeded"):
+        responses.get(
+            url=f"{DPS_JOB_URL}/{JOB_ID}/status",
+            body=STATUS_XML.format(job_id=JOB_ID, status=status),
+        )
+
+    assert job.wait_for_completion() is job
+    assert job.status == "Succeeded"
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_wait_for_completion_max_tries(job: DPSJob):
+    responses.get(
+        url=f"{DPS_JOB_URL}/{JOB_ID}/status",
+        body=STATUS_XML.format(job_id=JOB_ID, status="Running"),
+    )
+
+    with pytest.raises(RuntimeError):
+        job.wait_for_completion(max_tries=2)
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_wait_for_completion_retries_failed_requests(job: DPSJob):
+    url = f"{DPS_JOB_URL}/{JOB_ID}/status"
+    responses.get(url=url, body=requests.ConnectionError("connection reset"))
+    responses.get(url=url, body=STATUS_XML.format(job_id=JOB_ID, status="Succeeded"))
+
+    assert job.wait_for_completion() is job
+    assert job.status == "Succeeded"
+
+
+METRICS_XML = """<?xml version="1.0" ?>
+<metrics>
+    <machine_type>c5.4xlarge</machine_type>
+    <architecture/>
+    <machine_memory_size>None</machine_memory_size>
+    <directory_size>11272048640</directory_size>
+    <job_duration_seconds>259.060852</job_duration_seconds>
+    <cpu_usage>472452560263</cpu_usage>
+    <gpu_usage>0</gpu_usage>
+    <!-- reported by the DPS worker -->
+</metrics>"""
+
+RESULT_XML = (
+    '<wps:Result xmlns:ows="http://www.opengis.net/ows/2.0" xmlns:wps="http://www.opengis.net/wps/2.0">'
+    f"<wps:JobID>{JOB_ID}</wps:JobID>"
+    '<wps:Output id="output-2021-05-26T18:39:14.381083">'
+    "<wps:Data>http://bucket.s3-website.amazonaws.com/user/dps_output/algo/1</wps:Data>"
+    "<wps:Data>s3://s3.amazonaws.com:80/bucket/user/dps_output/algo/1</wps:Data>"
+    "<wps:Data>https://s3.console.aws.amazon.com/s3/buckets/bucket/1/?region=us-east-1&amp;tab=overview</wps:Data>"
+    "</wps:Output>"
+    "</wps:Result>"
+)
+
+ERROR_RESULT_XML = (
+    '<wps:Result xmlns:wps="http://www.opengis.net/wps/2.0">'
+    f"<wps:JobID>{JOB_ID}</wps:JobID>"
+    "<wps:Error><wps:Traceback>Traceback (most recent call last): ...</wps:Traceback></wps:Error>"
+    "</wps:Result>"
+)
+
+
+def test_set_job_status_result(config):
+    job = DPSJob(config)
+    job.set_job_status_result(STATUS_XML.format(job_id=JOB_ID, status="Running"))
+    assert job.id == JOB_ID
+    assert job.status == "Running"
+
+
+def test_set_job_status_result_parser_fallback(config):
+    # Escaped characters are left to the XML parser rather than the status regex
+    job = DPSJob(config)
+    job.set_job_status_result(STATUS_XML.format(job_id="job&amp;1", status="Accepted"))
+    assert job.id == "job&1"
+    assert job.status == "Accepted"
+
+
+def test_set_job_metrics_result(job: DPSJob):
+    job.set_job_metrics_result(METRICS_XML)
+    assert job.machine_type == "c5.4xlarge"
+    assert job.machine_memory_size is None
+    assert job.directory_size == 11272048640
+    assert job.job_duration_seconds == 259.060852
+    assert job.metrics["cpu_usage"] == 472452560263
+    # Only the reported metrics are present, and tags that are not DPS metrics are ignored
+    assert "operating_system" not in job.metrics
+    assert "gpu_usage" not in job.metrics
+    assert len(job.metrics) == 6
+    # Returned as a plain dict, as before
+    assert isinstance(job.metrics, dict)
+    assert json.loads(json.dumps(job.metrics))["machine_type"] == "c5.4xlarge"
+
+
+def test_set_job_metrics_result_missing_numbers(job: DPSJob):
+    job.set_job_metrics_result("<metrics><swap_usage>None</swap_usage><cpu_usage></cpu_usage><mem_usage/></metrics>")
+    assert job.swap_usage is None
+    assert job.cpu_usage is None
+    assert job.metrics["mem_usage"] is None
+
+
+def test_set_job_results_result(job: DPSJob):
+    job.set_job_results_result(RESULT_XML)
+    # Parsing the same result again replaces the outputs instead of appending to them
+    job.set_job_results_result(RESULT_XML)
+    assert job.outputs == [
+        "http://bucket.s3-website.amazonaws.com/user/dps_output/algo/1",
+        "s3://s3.amazonaws.com:80/bucket/user/dps_output/algo/1",
+        "https://s3.console.aws.amazon.com/s3/buckets/bucket/1/?region=us-east-1&tab=overview",
+    ]
+
+
+def test_set_job_results_result_multiple_outputs(job: DPSJob):
+    outputs = "".join(
+        f'<wps:Output id="output-{i}"><wps:Data>s3://bucket/{i}/a</wps:Data><wps:Data>s3://bucket/{i}/b</wps:Data></wps:Output>'
+        for i in range(3)
+    )
+    job.set_job_results_result(f'<wps:Result xmlns:wps="http://www.opengis.net/wps/2.0">{outputs}</wps:Result>')
+    assert job.outputs == [f"s3://bucket/{i}/{name}" for i in range(3) for name in "ab"]
+
+
+@pytest.mark.parametrize("data", [
+    "<wps:Data>s3://bucket/a</wps:Data><wps:Data>s3://bucket/b?x=1&amp;y=&lt;2&gt;</wps:Data>",
+    "<wps:Data></wps:Data><wps:Data/>",
+    "<wps:Data><![CDATA[s3://bucket/<a>]]></wps:Data>",
+    "<wps:Data>s3://bucket/&#38;a</wps:Data><!-- <wps:Data>ignored</wps:Data> -->",
+    '<wps:Data mimeType="text/plain">\n  s3://bucket/a\n</wps:Data>',
+])
+def test_set_job_results_result_matches_parser(job: DPSJob, data):
+    document = f'<wps:Result xmlns:wps="http://www.opengis.net/wps/2.0"><wps:Output id="o">{data}</wps:Output></wps:Result>'
+    expected = DPSJob(job.config).set_job_full_result(document).outputs
+    assert job.set_job_results_result(document).outputs == expected
+
+
+def test_set_job_results_result_same_on_both_paths(job: DPSJob):
+    document = ('<wps:Result xmlns:wps="http://www.opengis.net/wps/2.0"><wps:Data>s3://bucket/stray</wps:Data>'
+                '<wps:Output id="o"><wps:Data>s3://bucket/a</wps:Data></wps:Output>{}</wps:Result>')
+    fast = job.set_job_results_result(document.format("")).outputs
+    # A comment forces the parser
+    parsed = job.set_job_results_result(document.format("<!-- parsed -->")).outputs
+    assert fast == parsed == ["s3://bucket/a"]
+
+
+@responses.activate
+def test_retrieve_status_not_modified(job: DPSJob):
+    url = f"{DPS_JOB_URL}/{JOB_ID}/status"
+    responses.get(url=url, body=STATUS_XML.format(job_id=JOB_ID, status="Running"), headers={"ETag": '"v1"'})
+    responses.get(url=url, status=304, match=[responses.matchers.header_matcher({"If-None-Match": '"v1"'})])
+
+    assert job.retrieve_status() == "Running"
+    assert job.retrieve_status() == "Running"
+    assert "If-None-Match" not in responses.calls[0].request.headers
+    assert responses.calls[1].response.status_code == 304
+
+
+@responses.activate
+def test_retrieve_status_within_ttl(job: DPSJob):
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}/status", body=STATUS_XML.format(job_id=JOB_ID, status="Running"))
+    job.status_ttl = 60
+
+    assert job.retrieve_status() == "Running"
+    assert job.retrieve_status() == "Running"
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_retrieve_status_after_changing_id(job: DPSJob):
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}/status", body=STATUS_XML.format(job_id=JOB_ID, status="Running"),
+                  headers={"ETag": '"v1"'})
+    responses.get(url=f"{DPS_JOB_URL}/job-2/status", body=STATUS_XML.format(job_id="job-2", status="Failed"))
+    job.status_ttl = 60
+
+    assert job.retrieve_status() == "Running"
+    job.id = "job-2"
+    assert job.retrieve_status() == "Failed"
+    assert "If-None-Match" not in responses.calls[1].request.headers
+
+
+@responses.activate
+def test_bulk_retrieve_status(config):
+    jobs = []
+    for job_id, status in (("job-1", "Running"), ("job-2", "Succeeded"), ("job-3", "Failed")):
+        responses.get(url=f"{DPS_JOB_URL}/{job_id}/status", body=STATUS_XML.format(job_id=job_id, status=status))
+        job = DPSJob(config)
+        job.id = job_id
+        jobs.append(job)
+
+    assert DPSJob.bulk_retrieve_status(jobs) == ["Running", "Succeeded", "Failed"]
+    assert [job.status for job in jobs] == ["Running", "Succeeded", "Failed"]
+
+
+@responses.activate
+def test_retrieve_metrics_error_is_not_final(job: DPSJob):
+    url = f"{DPS_JOB_URL}/{JOB_ID}/metrics"
+    responses.get(url=url, status=404, body="<html>Not Found</html>")
+    responses.get(url=url, body=METRICS_XML)
+    job.status = "Succeeded"
+
+    with pytest.raises(requests.HTTPError):
+        job.retrieve_metrics()
+    # The failed request is not mistaken for the job's final metrics
+    assert job.retrieve_metrics()["machine_type"] == "c5.4xlarge"
+
+
+@responses.activate
+def test_retrieve_attributes_failed_job(job: DPSJob):
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}/status", body=STATUS_XML.format(job_id=JOB_ID, status="Failed"))
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}", body=ERROR_RESULT_XML)
+
+    job.retrieve_attributes()
+    assert job.status == "Failed"
+    assert job.traceback == ["Traceback (most recent call last): ..."]
+    # Metrics are not requested for failed jobs
+    assert len(responses.calls) == 2
+
+
+@pytest.mark.parametrize("status, body", [(500, "<html>Internal Server Error</html>"), (200, "not xml")])
+@responses.activate
+def test_retrieve_attributes_unreadable_metrics(job: DPSJob, status, body):
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}/status", body=STATUS_XML.format(job_id=JOB_ID, status="Succeeded"))
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}", body=RESULT_XML)
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}/metrics", status=status, body=body)
+
+    job.retrieve_attributes()
+    assert len(job.outputs) == 3
+    assert job.metrics == {}
+
+
+@responses.activate
+def test_retrieve_attributes_succeeded_job(job: DPSJob):
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}/status", body=STATUS_XML.format(job_id=JOB_ID, status="Succeeded"))
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}", body=RESULT_XML)
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}/metrics", body=METRICS_XML)
+
+    job.retrieve_attributes()
+    assert len(job.outputs) == 3
+    assert job.machine_type == "c5.4xlarge"
+
+    # The result and metrics of a finished job are not requested again
+    job.retrieve_result()
+    job.retrieve_metrics()
+    assert len(responses.calls) == 3
+    assert len(job.outputs) == 3
+
+
+FULL_RESULT_XML = (
+    '<wps:Result xmlns:wps="http://www.opengis.net/wps/2.0">'
+    f"<wps:JobID>{JOB_ID}</wps:JobID>"
+    "<wps:Status>Succeeded</wps:Status>"
+    '<wps:Output id="output-1"><wps:Data>s3://s3.amazonaws.com:80/bucket/user/dps_output/algo/1</wps:Data></wps:Output>'
+    "<metrics><machine_type>c5.4xlarge</machine_type><directory_size>11272048640</directory_size></metrics>"
+    "</wps:Result>"
+)
+
+
+@responses.activate
+def test_retrieve_attributes_full_snapshot(config):
+    config.dps_job_full = f"{DPS_JOB_URL}/full"
+    job = DPSJob(config)
+    job.id = JOB_ID
+    responses.get(url=f"{DPS_JOB_URL}/full/{JOB_ID}", body=FULL_RESULT_XML)
+
+    job.retrieve_attributes()
+    assert len(responses.calls) == 1
+    assert job.status == "Succeeded"
+    assert job.outputs == ["s3://s3.amazonaws.com:80/bucket/user/dps_output/algo/1"]
+    assert job.directory_size == 11272048640
+
+
+@pytest.mark.parametrize("status", [404, 403, 500])
+@responses.activate
+def test_retrieve_attributes_full_snapshot_unavailable(config, status):
+    config.dps_job_full = f"{DPS_JOB_URL}/full"
+    job = DPSJob(config)
+    job.id = JOB_ID
+    responses.get(url=f"{DPS_JOB_URL}/full/{JOB_ID}", status=status, body="<html>Error</html>")
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}/status", body=STATUS_XML.format(job_id=JOB_ID, status="Succeeded"))
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}", body=RESULT_XML)
+    responses.get(url=f"{DPS_JOB_URL}/{JOB_ID}/metrics", body=METRICS_XML)
+
+    job.retrieve_attributes()
+    # Server errors are retried by the config's session, so only the requested URLs are compared
+    assert {call.request.url for call in responses.calls} == {
+        f"{DPS_JOB_URL}/full/{JOB_ID}", f"{DPS_JOB_URL}/{JOB_ID}/status",
+        f"{DPS_JOB_URL}/{JOB_ID}", f"{DPS_JOB_URL}/{JOB_ID}/metrics",
+    }
+    assert len(job.outputs) == 3
+    assert job.machine_type == "c5.4xlarge"
+
+
+def test_set_job_full_result_failed_job(job: DPSJob):
+    job.set_job_full_result(
+        '<wps:Result xmlns:wps="http://www.opengis.net/wps/2.0">'
+        f"<wps:JobID>{JOB_ID}</wps:JobID><wps:Status>Failed</wps:Status>"
+        "<wps:Error><wps:Traceback>line 1</wps:Traceback><wps:Traceback>line 2</wps:Traceback></wps:Error>"
+        "</wps:Result>"
+    )
+    assert job.status == "Failed"
+    assert job.outputs == []
+    assert job.traceback == ["line 1", "line 2"]
@@ -0,0 +1,69 @@
+import requests
+import responses
+
+from maap.utils import requests_utils
+
+
+def test_generate_dps_headers(config):
+    config.content_type = "application/xml"
+    config.maap_token = "Bearer abc"
+    headers = requests_utils.generate_dps_headers(config, content_type="application/json")
+    assert headers == {"Accept": "application/xml", "Content-Type": "application/json", "Authorization": "Bearer abc"}
+
+    # Callers get their own copy of the cached headers
+    headers["token"] = "changed"
+    assert "token" not in requests_utils.generate_dps_headers(config, content_type="application/json")
+
+
+def test_generate_dps_headers_follows_config(config, monkeypatch):
+    config.content_type = "application/xml"
+    assert requests_utils.generate_dps_headers(config) == {"Accept": "application/xml", "token": "abc"}
+
+    config.maap_token = "def"
+    monkeypatch.setenv("MAAP_PGT", "ticket")
+    assert requests_utils.generate_dps_headers(config) == {
+        "Accept": "application/xml", "token": "def", "proxy-ticket": "ticket",
+    }
+
+
+@responses.activate
+def test_make_request_uses_config_session(config):
+    class RecordingSession(requests.Session):
+        urls = []
+
+        def request(self, method, url, *args, **kwargs):
+            self.urls.append(url)
+            return super().request(method, url, *args, **kwargs)
+
+    url = "https://api.maap-project.org/api/dps/job/1/status"
+    responses.get(url=url, body="ok")
+    config._session = RecordingSession()
+
+    assert requests_utils.make_dps_request(url, config) == "ok"
+    assert config.session.urls == [url]
+
+
+@responses.activate
+def test_config_session_retries_only_idempotent_requests(config):
+    url = "https://api.maap-project.org/api/dps/job"
+
+    responses.get(url=url, status=503)
+    responses.get(url=url, body="ok")
+    assert config.session.get(url).text == "ok"
+
+    responses.post(url=url, status=503)
+    responses.post(url=url, body="ok")
+    assert config.session.post(url).status_code == 503
+
+    local_url = "http://localhost:5000/api/dps/job"
+    responses.delete(url=local_url, status=502)
+    responses.delete(url=local_url, body="ok")
+    assert config.session.delete(local_url).text == "ok"
+
+
+def test_config_close_releases_connections(config):
+    session = config.session
+
+    config.close()
+    assert config.session is session
+    assert all(not adapter.poolmanager.pools for adapter in session.adapters.values())
@@ -0,0 +1,28 @@
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+from maap.utils import xml_utils
+
+
+def test_fromstring():
+    root = xml_utils.fromstring(b'<?xml version="1.0" encoding="UTF-8"?><a><b>x &amp; y</b></a>')
+    assert root.tag == "a"
+    assert root[0].text == "x & y"
+
+
+def test_fromstring_str_with_encoding_declaration():
+    root = xml_utils.fromstring('<?xml version="1.0" encoding="UTF-8"?><a>é</a>')
+    assert root.text == "é"
+
+
+def test_fromstring_across_threads():
+    documents = [f"<job><id>{i}</id></job>".encode() for i in range(32)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        ids = list(executor.map(lambda document: xml_utils.fromstring(document)[0].text, documents))
+    assert ids == [str(i) for i in range(32)]
+
+
+def test_iterparse():
+    events = [(event, element.tag) for event, element in xml_utils.iterparse(BytesIO(b"<a><b>x</b></a>"),
+                                                                             events=("start", "end"))]
+    assert events == [("start", "a"), ("start", "b"), ("end", "b"), ("end", "a")]